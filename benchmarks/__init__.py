@@ -0,0 +1,4 @@
+"""
+Standalone benchmarks for the translation package. Each module can be
+run with `python -m benchmarks.<module>` from the repository root.
+"""
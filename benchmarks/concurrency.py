@@ -0,0 +1,54 @@
+"""
+Wall-clock time of Translator.translate_many against batch size and
+concurrency, using a FakeBackend with artificial latency.
+
+    $ python -m benchmarks.concurrency [--latency 0.05] [--native-batching]
+"""
+import argparse
+import time
+
+import translation as tr
+
+
+BATCH_SIZES = (1, 10, 50, 100)
+CONCURRENCY = (1, 4, 8, 16, 32)
+
+
+def measure(batch_size, max_workers, backend):
+    translator = tr.Translator(backend=backend, max_workers=max_workers)
+    texts = [tr.Text(f"text {i}", tr.Language.DE, tr.Language.EN)
+             for i in range(batch_size)]
+
+    start = time.perf_counter()
+    translator.translate_many(texts)
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="seconds per backend request")
+    parser.add_argument("--native-batching", action="store_true",
+                        help="simulate a backend which translates a "
+                             "whole batch in one request (googletrans "
+                             "sends a request per text)")
+    args = parser.parse_args()
+
+    backend = tr.FakeBackend(latency=args.latency,
+                             batches_natively=args.native_batching)
+
+    print(f"backend latency: {args.latency * 1000:.0f} ms")
+    print("batch".rjust(6) + "".join(
+        f"workers={w}".rjust(12) for w in CONCURRENCY
+    ))
+
+    for size in BATCH_SIZES:
+        print(str(size).rjust(6) + "".join(
+            f"{measure(size, w, backend):11.3f}s"
+            for w in CONCURRENCY
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Synthetic Lambda events and context for the benchmarks. The events
+have the same shape as the fixtures in tests/conftest.py.
+"""
+import base64
+import itertools
+import json
+import uuid
+
+
+_SENTENCES = (
+    "Hallo zusammen, wie geht es euch heute?",
+    "Le chat est grand et il dort sur le canapé.",
+    "Hello, this is a message which has to be translated.",
+    "El perro corre en el parque todas las mañanas.",
+    "Здравейте, това е съобщение за превод.",
+)
+
+_LANGUAGES = ("DE", "FR", "EN", "ES", "BG")
+
+
+class LambdaContext:
+    def __init__(self, remaining_time_in_millis=900_000):
+        self.function_name = "poli-translator"
+        self.function_version = "$LATEST"
+        self.aws_request_id = "00000000-0000-0000-0000-000000000000"
+        self.__remaining_time_in_millis = remaining_time_in_millis
+
+    def get_remaining_time_in_millis(self):
+        return self.__remaining_time_in_millis
+
+
+def bodies(n, sentences_per_body=1):
+    """
+    :returns: a list of n strs, each made of sentences_per_body
+    sentences and a sequence number so that bodies don't repeat.
+    """
+    sentences = itertools.cycle(_SENTENCES)
+
+    return [
+        " ".join(next(sentences) for _ in range(sentences_per_body)) +
+        f" ({i})"
+        for i in range(n)
+    ]
+
+
+def sns_event(sentences_per_body=1):
+    """
+    :returns: an SNS event - SNS delivers a single record per event.
+    """
+    return {"Records": [{
+        "EventVersion": "1.0",
+        "EventSource": "aws:sns",
+        "Sns": {
+            "MessageId": str(uuid.uuid4()),
+            "Message": bodies(1, sentences_per_body)[0],
+            "MessageAttributes": _sns_attributes(0),
+            "Type": "Notification",
+        },
+    }]}
+
+
+def _sns_attributes(i):
+    return {
+        "from_language": {"Type": "String",
+                          "Value": _LANGUAGES[i % len(_LANGUAGES)]},
+        "to_language": {"Type": "String", "Value": "EN"},
+    }
+
+
+def sqs_event(n, sentences_per_body=1):
+    return {"Records": [
+        {
+            "body": body,
+            "messageAttributes": _sns_attributes(i),
+            "messageId": str(uuid.uuid4()),
+            "eventSource": "aws:sqs",
+            "eventSourceARN": "arn",
+            "awsRegion": "us-east-2",
+        }
+        for i, body in enumerate(bodies(n, sentences_per_body))
+    ]}
+
+
+def kinesis_event(n, sentences_per_body=1):
+    """
+    :returns: a Kinesis event whose records alternate between JSON
+    payloads with languages and plain text payloads.
+    """
+    return {"Records": [
+        {
+            "kinesis": {
+                "partitionKey": "1",
+                "sequenceNumber": f"4959033827149025660855969253{i:08}",
+                "data": base64.b64encode(_kinesis_payload(i, body)),
+            },
+            "eventSource": "aws:kinesis",
+            "eventID": f"shardId-000000000006:{i}",
+            "eventName": "aws:kinesis:record",
+            "awsRegion": "us-east-2",
+            "eventSourceARN": "arn",
+        }
+        for i, body in enumerate(bodies(n, sentences_per_body))
+    ]}
+
+
+def _kinesis_payload(i, body):
+    payload = (
+        json.dumps({"text": body,
+                    "from_language": _LANGUAGES[i % len(_LANGUAGES)],
+                    "to_language": "EN"})
+        if i % 2 == 0
+        else body
+    )
+
+    return payload.encode("utf-8")
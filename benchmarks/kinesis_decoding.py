@@ -0,0 +1,65 @@
+"""
+Micro-benchmark of decoding Kinesis records of realistic sizes: the
+previous ast.literal_eval path against the JSON fast path (orjson when
+installed, json otherwise).
+
+    $ python -m benchmarks.kinesis_decoding
+"""
+import ast
+import base64
+import json
+
+from translation import handler as hr
+
+from benchmarks import events
+from benchmarks import timing
+
+
+PAYLOAD_SENTENCES = (1, 10, 100)
+RECORDS = 1000
+
+
+def literal_eval_decoding(d):
+    str_data = base64.b64decode(d).decode("utf-8").strip()
+
+    if str_data.startswith("{") and str_data.endswith("}"):
+        try:
+            return ast.literal_eval(str_data)
+        except Exception:
+            pass
+
+    return {"text": str_data}
+
+
+def encoded_records(sentences):
+    return [
+        base64.b64encode(json.dumps({
+            "text": body,
+            "from_language": "DE",
+            "to_language": "EN",
+        }).encode("utf-8"))
+        for body in events.bodies(RECORDS, sentences)
+    ]
+
+
+def main():
+    print(f"JSON parser: {'orjson' if hr.orjson is not None else 'json'}")
+    results = {}
+
+    for sentences in PAYLOAD_SENTENCES:
+        records = encoded_records(sentences)
+        size = len(base64.b64decode(records[0]))
+
+        for name, decode in (("literal_eval", literal_eval_decoding),
+                             ("fast path", hr._decode_kinesis_data)):
+            results[f"{name}/{size} B"] = timing.measure(
+                lambda: [decode(r) for r in records],
+                RECORDS,
+                repeat=10
+            )
+
+    timing.print_table(results)
+
+
+if __name__ == "__main__":
+    main()
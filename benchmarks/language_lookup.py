@@ -0,0 +1,53 @@
+"""
+Micro-benchmark of Language.from_string and EventType.from_string: the
+previous getattr lookup against the precomputed lookup tables, on the
+strings found in events.
+
+    $ python -m benchmarks.language_lookup
+"""
+from translation import handler as hr
+from translation.language import Language
+
+from benchmarks import timing
+
+
+CALLS = 100_000
+
+LANGUAGE_STRINGS = ("EN", "de", "Fr", "es", "BG", "pl")
+
+EVENT_SOURCES = ("sqs", "kinesis", "sns")
+
+
+def getattr_language(s):
+    return getattr(Language, s.upper(), Language.OTHER)
+
+
+def getattr_event_type(name):
+    return getattr(hr.EventType, name.upper(), hr.EventType.CUSTOM)
+
+
+def calls_of(f, strings):
+    inputs = [strings[i % len(strings)] for i in range(CALLS)]
+
+    return lambda: [f(s) for s in inputs]
+
+
+def main():
+    results = {}
+
+    for name, f, strings in (
+            ("language/getattr", getattr_language, LANGUAGE_STRINGS),
+            ("language/table", Language.from_string, LANGUAGE_STRINGS),
+            ("language/table, tags", Language.from_string,
+             ("en-US", "bg_BG", "eng", "english", "de-AT", "zh-CN")),
+            ("event type/getattr", getattr_event_type, EVENT_SOURCES),
+            ("event type/table", hr.EventType.from_string, EVENT_SOURCES)):
+        results[name] = timing.measure(calls_of(f, strings),
+                                       CALLS,
+                                       repeat=10)
+
+    timing.print_table(results)
+
+
+if __name__ == "__main__":
+    main()
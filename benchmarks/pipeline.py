@@ -0,0 +1,127 @@
+"""
+Times the event-parsing and translation pipeline end to end against a
+FakeBackend, for synthetic SNS, SQS and Kinesis events of increasing
+size. Reports throughput, p50/p99 latency and peak memory and can save
+or compare against a baseline.
+
+    $ python -m benchmarks.pipeline --save baseline.json
+    $ python -m benchmarks.pipeline --compare baseline.json
+"""
+import argparse
+import contextlib
+import io
+import sys
+
+import lambda_function
+import translation as tr
+from translation import handler as hr
+
+from benchmarks import events
+from benchmarks import timing
+
+
+SIZES = (1, 10, 100, 1000)
+STREAM_WINDOW = 100
+
+
+def cases(sizes, latency):
+    """
+    :returns: a dict mapping case names to (callable, items, setup)
+    triples.
+    """
+    result = {}
+    sns = events.sns_event()
+    result["parse/sns/1"] = (lambda: hr._texts_from(sns), 1, None)
+
+    for size in sizes:
+        for name, event in (("sqs", events.sqs_event(size)),
+                            ("kinesis", events.kinesis_event(size))):
+            result.update(_cases_for(name, size, event, latency))
+
+    return result
+
+
+def _cases_for(name, size, event, latency):
+    texts = hr._texts_from(event)
+    translator = tr.Translator(backend=tr.FakeBackend(latency=latency))
+    handler_translator = tr.Translator(
+        backend=tr.FakeBackend(latency=latency)
+    )
+    context = events.LambdaContext()
+
+    def use_handler_translator():
+        lambda_function.translator = handler_translator
+
+    def consume_stream():
+        for _ in hr.stream(event, translator, window=STREAM_WINDOW):
+            pass
+
+    def handle():
+        with contextlib.redirect_stdout(io.StringIO()):
+            lambda_function.lambda_handler(event, context)
+
+    return {
+        f"parse/{name}/{size}": (lambda: hr._texts_from(event), size, None),
+        f"parse_batch/{name}/{size}": (
+            lambda: hr._text_batch_from(event), size, None
+        ),
+        f"translate_many/{name}/{size}": (
+            lambda: translator.translate_many(_copies_of(texts)), size, None
+        ),
+        f"translate_many_batch/{name}/{size}": (
+            lambda: translator.translate_many(
+                tr.TextBatch.from_texts(texts)
+            ),
+            size,
+            None
+        ),
+        f"stream/{name}/{size}": (consume_stream, size, None),
+        f"lambda_handler/{name}/{size}": (
+            handle, size, use_handler_translator
+        ),
+    }
+
+
+def _copies_of(texts):
+    return [tr.Text(t.body, t.from_language, t.to_language) for t in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="numbers of records per event")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds per backend call")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="fail if slower than a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown, defaults to 0.2")
+    args = parser.parse_args()
+
+    results = {
+        name: timing.measure(f, items, repeat=args.repeat, setup=setup)
+        for name, (f, items, setup) in cases(args.sizes,
+                                             args.latency).items()
+    }
+    timing.print_table(results)
+
+    if args.save is not None:
+        timing.save_baseline(results, args.save)
+
+    if args.compare is not None:
+        regressions = timing.compare_with_baseline(results,
+                                                   args.compare,
+                                                   args.tolerance)
+
+        for r in regressions:
+            print("REGRESSION", r, file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
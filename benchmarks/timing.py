@@ -0,0 +1,111 @@
+"""
+Helpers for timing callables and reporting the results.
+"""
+import json
+import math
+import time
+import tracemalloc
+from typing import NamedTuple
+
+
+class Measurement(NamedTuple):
+    items: int
+    p50: float
+    p99: float
+    peak_memory: int
+
+    @property
+    def throughput(self):
+        """
+        :returns: a float - items per second at the median latency.
+        """
+        return (self.items / self.p50
+                if self.p50 > 0
+                else math.inf)
+
+
+def percentile(values, p):
+    """
+    :param values: a non-empty sequence of numbers.
+    :param p: a number in [0, 100].
+    :returns: the nearest-rank percentile of the values.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+
+    return ordered[rank - 1]
+
+
+def measure(f, items, repeat=20, setup=None):
+    """
+    Runs f repeat times to collect latencies and once more under
+    tracemalloc to find its peak memory.
+
+    :param f: a callable without parameters.
+    :param items: an int - the number of items f processes per call.
+    :param setup: an optional callable run before each call of f,
+    outside of the timing.
+    :returns: a Measurement.
+    """
+    latencies = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        f()
+        latencies.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+
+    tracemalloc.start()
+
+    try:
+        f()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(items=items,
+                       p50=percentile(latencies, 50),
+                       p99=percentile(latencies, 99),
+                       peak_memory=peak)
+
+
+def print_table(results):
+    """
+    :param results: a dict mapping case names to Measurements.
+    """
+    print(f"{'case':<36}{'items/s':>12}{'p50 ms':>10}"
+          f"{'p99 ms':>10}{'peak KiB':>10}")
+
+    for name, m in results.items():
+        print(f"{name:<36}{m.throughput:>12.0f}{m.p50 * 1000:>10.3f}"
+              f"{m.p99 * 1000:>10.3f}{m.peak_memory / 1024:>10.1f}")
+
+
+def save_baseline(results, path):
+    with open(path, "w") as f:
+        json.dump({name: m._asdict() for name, m in results.items()},
+                  f,
+                  indent=2)
+
+
+def compare_with_baseline(results, path, tolerance):
+    """
+    :param tolerance: a number - the allowed relative slowdown of the
+    median latency, e.g. 0.2 for 20%.
+    :returns: a list of strs describing the regressions.
+    """
+    with open(path) as f:
+        baseline = {name: Measurement(**m)
+                    for name, m in json.load(f).items()}
+
+    return [
+        f"{name}: p50 {baseline[name].p50 * 1000:.3f} ms -> "
+        f"{m.p50 * 1000:.3f} ms"
+        for name, m in results.items()
+        if name in baseline and m.p50 > baseline[name].p50 * (1 + tolerance)
+    ]
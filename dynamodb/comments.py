@@ -1,4 +1,10 @@
 import datetime as dt
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from decimal import Decimal
 from typing import NamedTuple
 
@@ -18,6 +24,25 @@ class Comment(NamedTuple):
     text: str = ""
 
 
+class LoadReport(NamedTuple):
+    """
+    The outcome of Comments.bulk_load:
+     - items - the number of comments written
+     - failed - the number of comments which were still unprocessed
+       after the last retry
+     - seconds - the duration of the load
+    """
+    items: int
+    failed: int
+    seconds: float
+
+    @property
+    def items_per_second(self):
+        return (self.items / self.seconds
+                if self.seconds > 0
+                else 0.0)
+
+
 class Comments:
     """
     Represents a DynamoDB table with comments data:
@@ -40,15 +65,36 @@ class Comments:
         "WriteCapacityUnits": 10,
     }
 
-    def __init__(self, dynamo, name="Comments"):
+    # The maximum number of items in a BatchWriteItem request
+    __WRITE_BATCH_SIZE = 25
+
+    # The maximum number of keys in a BatchGetItem request
+    __GET_BATCH_SIZE = 100
+
+    # The write capacity one bulk_load thread is expected to use up
+    __WCU_PER_WRITER = 100
+
+    __MAX_WRITERS = 32
+
+    # Returned by __cached for keys which are not in the cache
+    __NOT_CACHED = object()
+
+    def __init__(self, dynamo, name="Comments", cache=None):
         """
         Loads a table or creates one, if it doesn't exist.
 
         :param dynamo: a DynamoDB boto3.resource
         :param name: a str - the name of the table, defaults to
         'Comments'.
+        :param cache: an LRUCache (see translation.cache) through which
+        get_comment, get_comments and query read, None means no
+        caching. Writes made through this instance update or
+        invalidate the cached entries, writes made elsewhere are seen
+        once the entries expire. Its stats() show how many reads it
+        saved.
         """
         self.__dynamo = dynamo
+        self.__cache = cache
         self.__load_or_create_table(name)
 
     def __load_or_create_table(self, name):
@@ -93,6 +139,9 @@ class Comments:
         self.__table.put_item(
             Item=self.__class__.__comment_to_json(comment)
         )
+        self.__store(comment.username,
+                     int(comment.datetime.timestamp()),
+                     comment)
 
     @staticmethod
     def __comment_to_json(c):
@@ -115,12 +164,135 @@ class Comments:
         :raises Error: if the table does not exist.
         """
         self.__verify_table_exists()
+        keys = []
 
         with self.__table.batch_writer() as writer:
             for c in comments:
-                writer.put_item(
-                    Item=self.__class__.__comment_to_json(c)
-                )
+                item = self.__class__.__comment_to_json(c)
+                writer.put_item(Item=item)
+
+                if self.__cache is not None:
+                    keys.append((item["username"], item["datetime"]))
+
+        for username, timestamp in keys:
+            self.__forget(username, timestamp)
+
+    @ddberror.wrap_client_error
+    def bulk_load(self,
+                  comments,
+                  max_workers=None,
+                  max_attempts=8,
+                  base_delay=0.05,
+                  max_delay=5.0):
+        """
+        Adds many comments to the table with BatchWriteItem requests
+        of 25 comments, sent from multiple threads. The comments are
+        consumed lazily, so the iterable may be a generator of
+        millions of them. Of comments with the same key in one
+        request only the last is written. Across requests the order
+        of writes is not defined.
+
+        :param comments: an iterable of Comment instances.
+        :param max_workers: an int - the number of threads sending
+        requests. Defaults to one per 100 provisioned write capacity
+        units, at most 32, or 32 for on-demand tables.
+        :param max_attempts: an int - the number of times a request
+        is sent for items left unprocessed by DynamoDB.
+        :param base_delay: a number - the seconds to wait before the
+        first retry, doubled for each next one (with jitter).
+        :param max_delay: a number - the maximum number of seconds to
+        wait before a retry.
+        :returns: a LoadReport.
+        :raises Error: if the table does not exist.
+        """
+        self.__verify_table_exists()
+
+        if max_workers is None:
+            max_workers = self.__writers_for_capacity()
+
+        start = time.monotonic()
+        items = failed = 0
+        chunks = self.__class__.__chunks_of(
+            map(self.__class__.__comment_to_json, comments),
+            self.__class__.__WRITE_BATCH_SIZE
+        )
+
+        def write(chunk):
+            return self.__write_chunk(chunk,
+                                      max_attempts,
+                                      base_delay,
+                                      max_delay)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = set()
+
+            for chunk in chunks:
+                if len(in_flight) >= 2 * max_workers:
+                    done, in_flight = wait(in_flight,
+                                           return_when=FIRST_COMPLETED)
+
+                    for f in done:
+                        written, unprocessed = f.result()
+                        items += written
+                        failed += unprocessed
+
+                in_flight.add(executor.submit(write, chunk))
+
+            for f in in_flight:
+                written, unprocessed = f.result()
+                items += written
+                failed += unprocessed
+
+        return LoadReport(items=items,
+                          failed=failed,
+                          seconds=time.monotonic() - start)
+
+    def __writers_for_capacity(self):
+        capacity = (self.__table.provisioned_throughput or {}).get(
+            "WriteCapacityUnits", 0
+        )
+        max_writers = self.__class__.__MAX_WRITERS
+
+        if not capacity:
+            return max_writers
+
+        return max(1, min(max_writers,
+                          -(-capacity // self.__class__.__WCU_PER_WRITER)))
+
+    @staticmethod
+    def __chunks_of(items, size):
+        items = iter(items)
+
+        while True:
+            chunk = list(itertools.islice(items, size))
+
+            if not chunk:
+                return
+
+            yield chunk
+
+    def __write_chunk(self, items, max_attempts, base_delay, max_delay):
+        unique = {(i["username"], i["datetime"]): i for i in items}
+        name = self.__table.name
+        requests = [{"PutRequest": {"Item": i}} for i in unique.values()]
+
+        for attempt in range(max_attempts):
+            if attempt > 0:
+                time.sleep(_backoff(attempt, base_delay, max_delay))
+
+            response = self.__table.meta.client.batch_write_item(
+                RequestItems={name: requests}
+            )
+
+            for username, timestamp in unique:
+                self.__forget(username, timestamp)
+
+            requests = response.get("UnprocessedItems", {}).get(name)
+
+            if not requests:
+                return len(unique), 0
+
+        return len(unique) - len(requests), len(requests)
 
     @ddberror.wrap_client_error
     def get_comment(self, username, datetime):
@@ -132,14 +304,114 @@ class Comments:
         """
         self.__verify_table_exists()
 
+        timestamp = int(datetime.timestamp())
+        key = ("comment", username, timestamp)
+        comment = self.__cached(key)
+
+        if comment is not self.__class__.__NOT_CACHED:
+            return comment
+
         item = self.__table.get_item(Key={
             "username": username,
-            "datetime": int(datetime.timestamp())
+            "datetime": timestamp
         }).get("Item")
+        comment = (self.__class__.__parse_comment(item)
+                   if item is not None
+                   else None)
+        self.__cache_put(key, comment)
 
-        return (self.__class__.__parse_comment(item)
-                if item is not None
-                else None)
+        return comment
+
+    @ddberror.wrap_client_error
+    def get_comments(self,
+                     keys,
+                     max_workers=4,
+                     max_attempts=8,
+                     base_delay=0.05,
+                     max_delay=5.0):
+        """
+        Gets multiple comments with BatchGetItem requests of up to 100
+        keys, sent concurrently. Each key is requested once, however
+        many times it is repeated.
+
+        :param keys: an iterable of (username, datetime) pairs, the
+        usernames being strs and the datetimes - datetime instances.
+        :param max_workers: an int - the maximum number of requests
+        sent at the same time.
+        :param max_attempts: an int - the number of times a request is
+        sent for keys left unprocessed by DynamoDB.
+        :param base_delay: a number - the seconds to wait before the
+        first retry, doubled for each next one (with jitter).
+        :param max_delay: a number - the maximum number of seconds to
+        wait before a retry.
+        :returns: a list with the Comment (or None) of each key, in the
+        order of the keys.
+        :raises Error: if the table does not exist or some keys are
+        still unprocessed after the last attempt.
+        """
+        self.__verify_table_exists()
+
+        keys = [(username, int(datetime.timestamp()))
+                for username, datetime in keys]
+        items = {}
+        uncached = []
+
+        for k in dict.fromkeys(keys):
+            comment = self.__cached(("comment", *k))
+
+            if comment is self.__class__.__NOT_CACHED:
+                uncached.append(k)
+            else:
+                items[k] = comment
+
+        chunks = list(self.__class__.__chunks_of(
+            uncached,
+            self.__class__.__GET_BATCH_SIZE
+        ))
+
+        def get(chunk):
+            return self.__get_chunk(chunk,
+                                    max_attempts,
+                                    base_delay,
+                                    max_delay)
+
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(chunks)))
+        ) as executor:
+            for chunk, found in zip(chunks, executor.map(get, chunks)):
+                for k in chunk:
+                    self.__cache_put(("comment", *k), found.get(k))
+
+                items.update(found)
+
+        return [items.get(k) for k in keys]
+
+    def __get_chunk(self, keys, max_attempts, base_delay, max_delay):
+        name = self.__table.name
+        request = {"Keys": [{"username": u, "datetime": d} for u, d in keys]}
+        found = {}
+
+        for attempt in range(max_attempts):
+            if attempt > 0:
+                time.sleep(_backoff(attempt, base_delay, max_delay))
+
+            response = self.__table.meta.client.batch_get_item(
+                RequestItems={name: request}
+            )
+
+            for i in response["Responses"].get(name, []):
+                found[(i["username"], int(i["datetime"]))] = (
+                    self.__class__.__parse_comment(i)
+                )
+
+            request = response.get("UnprocessedKeys", {}).get(name)
+
+            if not request:
+                return found
+
+        raise ddberror.Error(
+            f"{len(request['Keys'])} keys were not processed!"
+        )
 
     @staticmethod
     def __parse_comment(c):
@@ -175,7 +447,10 @@ class Comments:
             ReturnValues="ALL_NEW"
         )
 
-        return self.__class__.__parse_comment(response["Attributes"])
+        comment = self.__class__.__parse_comment(response["Attributes"])
+        self.__store(username, int(datetime.timestamp()), comment)
+
+        return comment
 
     @ddberror.wrap_client_error
     def query(self, username):
@@ -186,14 +461,203 @@ class Comments:
         :returns: a list of the Comments.
         :raises Error: if the table does not exist.
         """
+        key = ("query", username)
+        comments = self.__cached(key)
+
+        if comments is self.__class__.__NOT_CACHED:
+            comments = tuple(self.iter_query(username))
+            self.__cache_put(key, comments)
+
+        return list(comments)
+
+    def iter_query(self,
+                   username,
+                   since=None,
+                   until=None,
+                   page_size=None,
+                   attributes=None,
+                   descending=False):
+        """
+        Lazily queries for comments made by a specific user, one page
+        at a time, so that only the current page is held in memory.
+
+        :param username: a str.
+        :param since: a datetime instance - only comments made at or
+        after it are returned, None means no lower bound.
+        :param until: a datetime instance - only comments made at or
+        before it are returned, None means no upper bound.
+        :param page_size: an int - the maximum number of comments
+        read with one request, None means as many as fit in 1 MB.
+        :param attributes: an iterable of strs - the names of the
+        attributes to read, the key attributes are always read. None
+        means all attributes.
+        :param descending: a bool - whether the newest comments come
+        first.
+        :returns: a generator of Comments, in chronological order
+        unless descending is True.
+        :raises Error: if the table does not exist or (while iterating)
+        the query fails.
+        """
         self.__verify_table_exists()
 
-        response = self.__table.query(
-            KeyConditionExpression=Key("username").eq(username)
+        return self.__iter_query_items(
+            self.__class__.__query_kwargs(username,
+                                          since,
+                                          until,
+                                          page_size,
+                                          attributes,
+                                          descending)
         )
 
-        return [self.__class__.__parse_comment(i)
-                for i in response["Items"]]
+    @staticmethod
+    def __query_kwargs(username,
+                       since,
+                       until,
+                       page_size,
+                       attributes,
+                       descending):
+        condition = Key("username").eq(username)
+        datetime = Key("datetime")
+
+        if since is not None and until is not None:
+            condition &= datetime.between(int(since.timestamp()),
+                                          int(until.timestamp()))
+        elif since is not None:
+            condition &= datetime.gte(int(since.timestamp()))
+        elif until is not None:
+            condition &= datetime.lte(int(until.timestamp()))
+
+        kwargs = {
+            "KeyConditionExpression": condition,
+            "ScanIndexForward": not descending,
+        }
+
+        if page_size is not None:
+            kwargs["Limit"] = page_size
+
+        if attributes is not None:
+            names = dict.fromkeys(["username", "datetime", *attributes])
+            placeholders = {f"#a{i}": n for i, n in enumerate(names)}
+            kwargs["ProjectionExpression"] = ", ".join(placeholders)
+            kwargs["ExpressionAttributeNames"] = placeholders
+
+        return kwargs
+
+    @ddberror.wrap_client_error
+    def __iter_query_items(self, kwargs):
+        while True:
+            response = self.__table.query(**kwargs)
+
+            for i in response["Items"]:
+                yield self.__class__.__parse_comment(i)
+
+            last_key = response.get("LastEvaluatedKey")
+
+            if last_key is None:
+                return
+
+            kwargs = {**kwargs, "ExclusiveStartKey": last_key}
+
+    def scan_all(self, segments=4, max_rcu=None, page_size=None):
+        """
+        Reads the whole table with a parallel scan - each of the
+        segments is scanned by a separate thread and their comments are
+        merged into one iterator. The threads stay at most a few pages
+        ahead of the consumer, so memory use does not grow with the
+        size of the table. Closing the iterator stops them.
+
+        :param segments: an int - the number of segments (and threads).
+        :param max_rcu: a number - the maximum read capacity units
+        consumed per second by all segments together, None means no
+        limit.
+        :param page_size: an int - the maximum number of items read
+        with one request, None means as many as fit in 1 MB. Smaller
+        pages make the rate limit smoother.
+        :returns: a generator of Comments, in no particular order.
+        :raises Error: if the table does not exist or (while iterating)
+        a scan fails.
+        """
+        if segments < 1:
+            raise ValueError("segments must be a positive int!")
+
+        self.__verify_table_exists()
+
+        return self.__merge_segments(
+            segments,
+            _CapacityPacer(max_rcu) if max_rcu is not None else None,
+            page_size
+        )
+
+    @ddberror.wrap_client_error
+    def __merge_segments(self, segments, pacer, page_size):
+        pages = queue.Queue(maxsize=2 * segments)
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self.__scan_segment,
+                             args=(s, segments, pacer, page_size,
+                                   pages, stop),
+                             daemon=True)
+            for s in range(segments)
+        ]
+
+        for t in threads:
+            t.start()
+
+        try:
+            finished = 0
+
+            while finished < segments:
+                page = pages.get()
+
+                if page is None:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop.set()
+
+            for t in threads:
+                t.join()
+
+    def __scan_segment(self, segment, segments, pacer, page_size,
+                       pages, stop):
+        kwargs = {
+            "TableName": self.__table.name,
+            "Segment": segment,
+            "TotalSegments": segments,
+            "ReturnConsumedCapacity": "TOTAL",
+        }
+
+        if page_size is not None:
+            kwargs["Limit"] = page_size
+
+        try:
+            while not stop.is_set():
+                response = self.__table.meta.client.scan(**kwargs)
+
+                if pacer is not None and stop.wait(pacer.reserve(
+                        response["ConsumedCapacity"]["CapacityUnits"]
+                )):
+                    return
+
+                page = [self.__class__.__parse_comment(i)
+                        for i in response["Items"]]
+
+                if page and not _put(pages, page, stop):
+                    return
+
+                last_key = response.get("LastEvaluatedKey")
+
+                if last_key is None:
+                    break
+
+                kwargs["ExclusiveStartKey"] = last_key
+        except Exception as e:
+            _put(pages, e, stop)
+        else:
+            _put(pages, None, stop)
 
     @ddberror.wrap_client_error
     def delete_comment(self, username, datetime):
@@ -204,10 +668,12 @@ class Comments:
         """
         self.__verify_table_exists()
 
+        timestamp = int(datetime.timestamp())
         self.__table.delete_item(Key={
             "username": username,
-            "datetime": int(datetime.timestamp())
+            "datetime": timestamp
         })
+        self.__store(username, timestamp, None)
 
     @ddberror.wrap_client_error
     def delete(self):
@@ -218,6 +684,90 @@ class Comments:
             self.__table.delete()
             self.__table = None
 
+        if self.__cache is not None:
+            self.__cache.clear()
+
+    def __cached(self, key):
+        return (self.__cache.get(key, self.__class__.__NOT_CACHED)
+                if self.__cache is not None
+                else self.__class__.__NOT_CACHED)
+
+    def __cache_put(self, key, value):
+        if self.__cache is not None:
+            self.__cache.put(key, value)
+
+    def __store(self, username, timestamp, comment):
+        """
+        Writes a comment (None for a deleted one) through to the cache
+        and invalidates the cached query of its user.
+        """
+        if self.__cache is not None:
+            self.__cache.put(("comment", username, timestamp), comment)
+            self.__cache.invalidate(("query", username))
+
+    def __forget(self, username, timestamp):
+        if self.__cache is not None:
+            self.__cache.invalidate(("comment", username, timestamp))
+            self.__cache.invalidate(("query", username))
+
+    @property
+    def cache(self):
+        return self.__cache
+
+
+def _backoff(attempt, base_delay, max_delay):
+    """
+    :returns: the seconds to wait before a retry - a random number up
+    to base_delay * 2 ** (attempt - 1), capped at max_delay.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def _put(q, item, stop):
+    """
+    Puts item in the queue unless stop is set first.
+
+    :returns: whether the item was put.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        else:
+            return True
+
+    return False
+
+
+class _CapacityPacer:
+    """
+    Spaces out requests so that the capacity they consume averages at
+    most capacity_per_second. The capacity of a request is only known
+    after it is made, so each request delays the next ones instead.
+    """
+    def __init__(self, capacity_per_second, clock=time.monotonic):
+        if capacity_per_second <= 0:
+            raise ValueError("The capacity must be positive!")
+
+        self.__capacity_per_second = capacity_per_second
+        self.__clock = clock
+        self.__next = clock()
+        self.__lock = threading.Lock()
+
+    def reserve(self, capacity):
+        """
+        Records capacity consumed by a request.
+
+        :returns: the seconds to wait before making the next request.
+        """
+        with self.__lock:
+            now = self.__clock()
+            self.__next = (max(self.__next, now) +
+                           capacity / self.__capacity_per_second)
+
+            return self.__next - now
+
 
 if __name__ == "__main__":
     import os
@@ -1,3 +1,5 @@
+import json
+
 from dynamodb import error as ddberror
 
 
@@ -12,3 +14,29 @@ def list_tables(dynamo):
         table.name
         for table in dynamo.tables.all()
     ]
+
+
+@ddberror.wrap_client_error
+def dump_jsonl(comments, path):
+    """
+    Writes comments to a JSON lines file, one comment per line, as
+    they are read, so an iterator over a whole table (e.g. from
+    Comments.scan_all) is never held in memory.
+
+    :param comments: an iterable of Comment instances.
+    :param path: a str or a path-like object.
+    :returns: an int - the number of comments written.
+    """
+    count = 0
+
+    with open(path, "w", encoding="utf-8") as f:
+        for c in comments:
+            f.write(json.dumps({
+                "username": c.username,
+                "datetime": int(c.datetime.timestamp()),
+                "text": c.text,
+            }, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+
+    return count
@@ -1,3 +1,4 @@
+import inspect
 from functools import wraps
 
 from botocore.exceptions import ClientError
@@ -18,6 +19,21 @@ def is_resource_not_found(e):
 
 
 def wrap_client_error(f):
+    """
+    Makes f raise Error instead of botocore's ClientError. Generator
+    functions are wrapped so that errors raised while iterating over
+    the generator are replaced too.
+    """
+    if inspect.isgeneratorfunction(f):
+        @wraps(f)
+        def generator_wrapper(*args, **kwargs):
+            try:
+                return (yield from f(*args, **kwargs))
+            except ClientError as e:
+                raise Error.from_client_error(e)
+
+        return generator_wrapper
+
     @wraps(f)
     def wrapper(*args, **kwargs):
         try:
@@ -1,25 +1,206 @@
+import json
+import os
 import sys
+import time
 
 import translation as tr
 
 
-translator = tr.Translator(default_to_lang=tr.Language.EN)
+max_workers = int(os.getenv("TRANSLATION_MAX_WORKERS", "1"))
+connect_timeout = float(os.getenv("TRANSLATION_CONNECT_TIMEOUT", "5"))
+read_timeout = float(os.getenv("TRANSLATION_READ_TIMEOUT", "10"))
+# A request started right before the deadline must end before the
+# function times out
+deadline_margin = float(os.getenv("TRANSLATION_DEADLINE_MARGIN",
+                                  str(connect_timeout + read_timeout)))
+# The largest part of the remaining time the margin takes, so that short
+# function timeouts (e.g. the default 3 seconds) leave time to translate
+max_margin_fraction = 0.5
+window = int(os.getenv("TRANSLATION_WINDOW", "0")) or None
+cache_size = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))
+cache_ttl = float(os.getenv("TRANSLATION_CACHE_TTL", "3600"))
+max_chunk_chars = int(os.getenv("TRANSLATION_MAX_CHUNK_CHARS", "4500")) or None
+log_mode = tr.LogMode.from_string(os.getenv("TRANSLATION_LOG_MODE", "verbose"))
+log_sample_rate = float(os.getenv("TRANSLATION_LOG_SAMPLE_RATE", "1"))
+log_max_chars = int(os.getenv("TRANSLATION_LOG_MAX_CHARS", "0")) or None
+metrics_namespace = os.getenv("TRANSLATION_METRICS_NAMESPACE",
+                              "PoliTranslator")
+response_mode = os.getenv("TRANSLATION_RESPONSE_MODE", "full").strip().lower()
+
+if response_mode not in ("full", "compact"):
+    raise ValueError(f"Unknown response mode: {response_mode!r}")
+
+max_response_bytes = int(os.getenv("TRANSLATION_MAX_RESPONSE_BYTES",
+                                   "5000000"))
+spill_directory = os.getenv("TRANSLATION_SPILL_DIR", "")
+
+# Where translations over max_response_bytes are stored instead of being
+# returned, any object with the put method of translation.blobs.BlobStore
+blob_store = (tr.LocalBlobStore(spill_directory)
+              if spill_directory
+              else None)
+
+cache = tr.LRUCache(max_size=cache_size, ttl=cache_ttl)
+detection_cache = tr.LRUCache(max_size=cache_size, ttl=cache_ttl)
+
+pool = tr.ConnectionPool(
+    max_connections=max_workers,
+    connect_timeout=connect_timeout,
+    read_timeout=read_timeout
+)
+
+rate_limit = float(os.getenv("TRANSLATION_RATE_LIMIT", "0"))
+rate_limiter = (tr.AdaptiveRateLimiter(rate=rate_limit)
+                if rate_limit > 0
+                else None)
+shared_cache_table = os.getenv("TRANSLATION_SHARED_CACHE_TABLE", "")
+
+
+def create_shared_cache(name):
+    """
+    :returns: a DynamoCache for the table with the given name or None,
+    if it can't be loaded or created (e.g. for lack of permissions), so
+    that the function runs without it instead of failing every
+    invocation. The error is logged.
+    """
+    import boto3
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    try:
+        return tr.DynamoCache(
+            boto3.resource("dynamodb"),
+            name=name,
+            ttl=float(os.getenv("TRANSLATION_SHARED_CACHE_TTL", "604800"))
+        )
+    except (BotoCoreError, ClientError) as e:
+        sys.stdout.write(
+            f"Running without the shared cache {name!r}: {e}\n"
+        )
+
+        return None
+
+
+shared_cache = (create_shared_cache(shared_cache_table)
+                if shared_cache_table
+                else None)
+
+metrics = (tr.Metrics()
+           if metrics_namespace
+           else None)
+retry = tr.Retry(
+    max_attempts=int(os.getenv("TRANSLATION_MAX_ATTEMPTS", "3"))
+)
+
+translator = tr.Translator(
+    default_to_lang=tr.Language.EN,
+    backend=tr.GoogleBackend(pool=pool),
+    max_workers=max_workers,
+    cache=cache,
+    detection_cache=detection_cache,
+    rate_limiter=rate_limiter,
+    retry=retry,
+    max_chunk_chars=max_chunk_chars,
+    metrics=metrics,
+    shared_cache=shared_cache
+)
 
 
 def log_results(pairs):
-    for i, (text, translation) in enumerate(pairs):
-        print("ITEM ", i + 1)
-        print("Original:", text)
-        print("Translation:", translation)
+    sys.stdout.write(tr.format_log(pairs,
+                                   log_mode,
+                                   log_sample_rate,
+                                   log_max_chars))
+
+
+def deadline_of(context):
+    remaining = context.get_remaining_time_in_millis() / 1000
+
+    return (time.monotonic() +
+            remaining -
+            min(deadline_margin, remaining * max_margin_fraction))
+
+
+def emit_metrics(context):
+    """
+    Writes the metrics of the invocation to stdout in the CloudWatch
+    Embedded Metric Format.
+    """
+    record = metrics.to_emf(metrics_namespace,
+                            {"FunctionName": context.function_name})
+    sys.stdout.write(json.dumps(record) + "\n")
+
+
+def json_size_bound(value):
+    """
+    :param value: a str, None, or a list, tuple or dict of such values.
+    :returns: an int - an upper bound of the size of value as JSON,
+    computed without serializing it. An ASCII character takes at most 6
+    bytes when escaped and any other one at most 12 (a surrogate pair).
+    """
+    if value is None:
+        return 4
+
+    if isinstance(value, str):
+        return (6 if value.isascii() else 12) * len(value) + 2
+
+    if isinstance(value, dict):
+        return 2 + sum(json_size_bound(k) + json_size_bound(v) + 4
+                       for k, v in value.items())
+
+    return 2 + sum(json_size_bound(v) + 2 for v in value)
+
+
+def translation_of(response, context):
+    """
+    :returns: a (key, value) pair for the translation in the result of
+    lambda_handler - the translations themselves or, if they are too
+    large and there is a blob store, a reference to them. They are
+    serialized to find out only if the bound of their size is over
+    max_response_bytes.
+    """
+    translation = (response.compact_translation()
+                   if response_mode == "compact"
+                   else response.translation)
+
+    if (blob_store is not None and
+            json_size_bound(translation) > max_response_bytes):
+        data = json.dumps(translation).encode("utf-8")
+
+        if len(data) > max_response_bytes:
+            return (
+                "translation-ref",
+                blob_store.put(f"{context.aws_request_id}.json", data)
+            )
+
+    return ("translation", translation)
 
 
 def lambda_handler(event, context):
-    translation = tr.lambda_handler(event, translator)
-    log_results(translation)
-
-    return {
-        "py-version": sys.version_info,
-        "func-name": context.function_name,
-        "func-version": context.function_version,
-        "translation": translation,
-    }
+    if metrics is not None:
+        metrics.reset()
+
+    response = tr.handle_event(event,
+                               translator,
+                               window,
+                               deadline_of(context))
+
+    with tr.timed(metrics, "respond"):
+        log_results(response.translation)
+
+        key, translation = translation_of(response, context)
+        result = {
+            "func-name": context.function_name,
+            "func-version": context.function_version,
+            key: translation,
+        }
+
+        if response_mode == "full":
+            result = {"py-version": sys.version_info, **result}
+
+        if response.batch_item_failures is not None:
+            result["batchItemFailures"] = response.batch_item_failures
+
+    if metrics is not None:
+        emit_metrics(context)
+
+    return result
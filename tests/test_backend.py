@@ -0,0 +1,146 @@
+import time
+import types
+
+import pytest
+
+from translation.backend import FakeBackend, GoogleBackend, Throttled
+from translation.pool import ConnectionPool
+
+
+class _StubGoogleClient:
+    def translate(self, text, src, dest):
+        if isinstance(text, list):
+            return [self.translate(t, src, dest) for t in text]
+
+        return types.SimpleNamespace(text=text.upper())
+
+    def detect(self, text):
+        if isinstance(text, list):
+            return [self.detect(t) for t in text]
+
+        return types.SimpleNamespace(lang="de")
+
+
+class TestGoogleBackend:
+    def test_translations_are_unwrapped(self):
+        backend = GoogleBackend(_StubGoogleClient())
+
+        assert backend.translate("a", "de", "en") == "A"
+        assert backend.translate_batch(("a", "b"), "de", "en") == ["A", "B"]
+
+    def test_detections_are_unwrapped(self):
+        backend = GoogleBackend(_StubGoogleClient())
+
+        assert backend.detect("a") == "de"
+        assert backend.detect_batch(["a", "b"]) == ["de", "de"]
+
+
+class TestFakeBackend:
+    def test_translation_is_deterministic(self):
+        backend = FakeBackend()
+
+        assert backend.translate("Hallo", "de", "en") == "Hallo (de->en)"
+        assert backend.translate_batch(["a", "b"], "de", "fr") == [
+            "a (de->fr)", "b (de->fr)"
+        ]
+
+    def test_detection_returns_configured_language(self):
+        backend = FakeBackend(detected_language="bg")
+
+        assert backend.detect_batch(["a", "b"]) == ["bg", "bg"]
+
+    def test_calls_are_recorded(self):
+        backend = FakeBackend()
+        backend.translate("a", "de", "en")
+        backend.detect_batch(["b", "c"])
+
+        assert backend.calls == [("translate", ["a"]), ("detect", ["b", "c"])]
+
+    def test_configured_texts_fail(self):
+        backend = FakeBackend(fail_on=["bad"], error=TimeoutError)
+
+        with pytest.raises(TimeoutError):
+            backend.translate_batch(["good", "bad"], "de", "en")
+
+    def test_error_rate_is_deterministic(self):
+        texts = [f"text {i}" for i in range(200)]
+
+        def failures():
+            backend = FakeBackend(error_rate=0.25)
+            failed = set()
+
+            for t in texts:
+                try:
+                    backend.detect(t)
+                except RuntimeError:
+                    failed.add(t)
+
+            return failed
+
+        failed = failures()
+
+        assert failed == failures()
+        assert 20 < len(failed) < 80
+
+    def test_error_rate_must_be_a_fraction(self):
+        with pytest.raises(ValueError):
+            FakeBackend(error_rate=1.5)
+
+    def test_latency_is_simulated(self):
+        backend = FakeBackend(latency=0.01, latency_per_text=0.005)
+
+        start = time.perf_counter()
+        backend.translate_batch(["a", "b"], "de", "en")
+
+        assert time.perf_counter() - start >= 0.02
+
+
+class TestGoogleBackendClient:
+    def test_client_uses_the_connection_pool(self):
+        pool = ConnectionPool()
+        backend = GoogleBackend(pool=pool)
+
+        try:
+            assert backend.client.client is pool.client
+        finally:
+            pool.close()
+
+
+class _StubStatusClient:
+    def __init__(self, status_code):
+        self.__status_code = status_code
+
+    def translate(self, text, src, dest):
+        return [
+            types.SimpleNamespace(
+                text=t,
+                _response=types.SimpleNamespace(
+                    status_code=self.__status_code
+                )
+            )
+            for t in text
+        ]
+
+
+class TestGoogleBackendErrors:
+    def test_too_many_requests_is_throttled(self):
+        backend = GoogleBackend(_StubStatusClient(429))
+
+        with pytest.raises(Throttled):
+            backend.translate("a", "de", "en")
+
+    def test_unexpected_status_is_connection_error(self):
+        backend = GoogleBackend(_StubStatusClient(503))
+
+        with pytest.raises(ConnectionError):
+            backend.translate_batch(["a"], "de", "en")
+
+
+class TestTransientFailures:
+    def test_texts_succeed_after_configured_failures(self):
+        backend = FakeBackend(fail_on=["a"], failures_per_text=1)
+
+        with pytest.raises(RuntimeError):
+            backend.translate("a", "de", "en")
+
+        assert backend.translate("a", "de", "en") == "a (de->en)"
@@ -0,0 +1,34 @@
+import pytest
+
+from translation.blobs import LocalBlobStore
+
+
+class TestLocalBlobStore:
+    def test_stored_blob_is_returned(self, tmp_path):
+        store = LocalBlobStore(tmp_path / "blobs")
+
+        reference = store.put("request.json", b"[1, 2]")
+
+        assert reference.startswith("file://")
+        assert store.get(reference) == b"[1, 2]"
+        assert (tmp_path / "blobs" / "request.json").read_bytes() == b"[1, 2]"
+
+    def test_blob_is_overwritten(self, tmp_path):
+        store = LocalBlobStore(tmp_path)
+        store.put("request.json", b"old")
+
+        reference = store.put("request.json", b"new")
+
+        assert store.get(reference) == b"new"
+        assert [p.name for p in tmp_path.iterdir()] == ["request.json"]
+
+    @pytest.mark.parametrize("name", ["", "../request.json", "a/b.json"])
+    def test_names_must_not_be_paths(self, tmp_path, name):
+        with pytest.raises(ValueError):
+            LocalBlobStore(tmp_path).put(name, b"data")
+
+    def test_references_of_other_stores_are_rejected(self, tmp_path):
+        reference = LocalBlobStore(tmp_path / "a").put("x.json", b"data")
+
+        with pytest.raises(ValueError):
+            LocalBlobStore(tmp_path / "b").get(reference)
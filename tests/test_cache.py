@@ -0,0 +1,102 @@
+import pytest
+
+from translation import Language
+from translation.cache import LRUCache, normalize, translation_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestConstructor:
+    def test_max_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
+
+    def test_ttl_must_be_positive(self):
+        with pytest.raises(ValueError):
+            LRUCache(ttl=0)
+
+
+class TestLRUCache:
+    def test_missing_key_returns_default(self):
+        cache = LRUCache()
+
+        assert cache.get("key") is None
+        assert cache.get("key", "default") == "default"
+
+    def test_stored_value_is_returned(self):
+        cache = LRUCache()
+        cache.put("key", "value")
+
+        assert cache.get("key") == "value"
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.put("key", "value")
+
+        clock.now = 9.9
+        assert cache.get("key") == "value"
+
+        clock.now = 10
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_hits_and_misses_are_counted(self):
+        cache = LRUCache()
+        cache.put("key", "value")
+
+        cache.get("key")
+        cache.get("key")
+        cache.get("other")
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+        assert stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_invalidated_entry_is_removed(self):
+        cache = LRUCache()
+        cache.put("key", "value")
+
+        cache.invalidate("key")
+        cache.invalidate("other")
+
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_hit_rate_without_lookups_is_zero(self):
+        assert LRUCache().stats().hit_rate == 0.0
+
+
+class TestTranslationKey:
+    def test_body_is_normalized(self):
+        assert normalize("  Café \n") == "Café"
+
+    def test_equal_for_same_normalized_body_and_languages(self):
+        assert (
+            translation_key(" hello", Language.EN, Language.DE) ==
+            translation_key("hello ", Language.EN, Language.DE)
+        )
+
+    def test_differs_for_different_languages(self):
+        assert (
+            translation_key("hello", Language.EN, Language.DE) !=
+            translation_key("hello", Language.EN, Language.FR)
+        )
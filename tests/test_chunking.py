@@ -0,0 +1,51 @@
+import pytest
+
+from translation.chunking import join, split
+
+
+def joined(pairs):
+    return join([c for c, _ in pairs], [s for _, s in pairs])
+
+
+def test_short_text_is_not_split():
+    assert split("Hello there.", 20) == [("Hello there.", "")]
+
+
+def test_max_chars_must_be_positive():
+    with pytest.raises(ValueError):
+        split("Hello", 0)
+
+
+def test_paragraphs_are_preferred_over_sentences():
+    body = "One. Two.\n\nThree. Four."
+
+    assert split(body, 12) == [("One. Two.", "\n\n"), ("Three. Four.", "")]
+
+
+def test_long_paragraphs_are_split_at_sentences():
+    body = "First one. Second one! Third one?"
+
+    assert split(body, 22) == [("First one. Second one!", " "),
+                               ("Third one?", "")]
+    assert split(body, 21) == [("First one.", " "),
+                               ("Second one!", " "),
+                               ("Third one?", "")]
+
+
+def test_long_sentences_are_split_between_words():
+    assert split("aaa bbb ccc", 7) == [("aaa bbb", " "), ("ccc", "")]
+
+
+def test_long_words_are_split_at_max_chars():
+    assert split("abcdefgh ij", 3) == [("abc", ""), ("def", ""),
+                                       ("gh", " "), ("ij", "")]
+
+
+@pytest.mark.parametrize("max_chars", [1, 5, 13, 40])
+def test_joining_chunks_gives_back_the_text(max_chars):
+    body = ("  Hallo zusammen. Wie geht's?\n\n"
+            "Mir geht es gut!  Danke.\n \n\tTschüss…  ")
+    pairs = split(body, max_chars)
+
+    assert joined(pairs) == body
+    assert all(len(c) <= max_chars for c, _ in pairs)
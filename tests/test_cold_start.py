@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Cumulative import time of lambda_function, in microseconds
+IMPORT_TIME_BUDGET = 150_000
+
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_lambda_function(code=""):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import lambda_function\n{code}"],
+        cwd=_REPOSITORY_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def _cumulative_import_time(stderr, module):
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+
+    pytest.fail(f"No import time recorded for {module}")
+
+
+def test_import_time_is_within_budget():
+    stderr = _import_lambda_function().stderr
+
+    assert (
+        _cumulative_import_time(stderr, "lambda_function") <
+        IMPORT_TIME_BUDGET
+    )
+
+
+def test_backend_client_is_not_imported_at_cold_start():
+    result = _import_lambda_function(
+        "import sys\n"
+        "print(sorted({'googletrans', 'httpx'} & set(sys.modules)))"
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_backend_client_is_created_on_first_use():
+    result = _import_lambda_function(
+        "import sys\n"
+        "lambda_function.translator.backend.client\n"
+        "print('googletrans' in sys.modules)"
+    )
+
+    assert result.stdout.strip() == "True"
@@ -0,0 +1,440 @@
+import datetime as dt
+import json
+import threading
+import time
+
+import pytest
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+from botocore.exceptions import ClientError
+
+from dynamodb import error as ddberror
+from dynamodb.comments import Comment, Comments, _CapacityPacer
+from dynamodb.convenience import dump_jsonl
+from translation.cache import LRUCache
+
+
+@pytest.fixture
+def dynamo(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+
+    with moto.mock_aws():
+        yield boto3.resource("dynamodb", region_name="us-east-1")
+
+
+@pytest.fixture
+def comments(dynamo):
+    return Comments(dynamo)
+
+
+def comments_of(username, n):
+    return [
+        Comment(username, dt.datetime.fromtimestamp(1692249109 + i), f"c{i}")
+        for i in range(n)
+    ]
+
+
+class TestBulkLoad:
+    def test_all_comments_are_written(self, comments):
+        loaded = comments_of("thomasshelby", 60)
+
+        report = comments.bulk_load(iter(loaded), max_workers=3)
+
+        assert report.items == 60
+        assert report.failed == 0
+        assert report.items_per_second > 0
+        assert comments.get_comment("thomasshelby",
+                                    loaded[59].datetime) == loaded[59]
+
+    def test_requests_have_at_most_25_items(self, comments, dynamo,
+                                            monkeypatch):
+        client = dynamo.meta.client
+        batch_write_item = client.batch_write_item
+        sizes = []
+
+        def recording_batch_write_item(RequestItems):
+            sizes.extend(len(r) for r in RequestItems.values())
+            return batch_write_item(RequestItems=RequestItems)
+
+        monkeypatch.setattr(client, "batch_write_item",
+                            recording_batch_write_item)
+
+        comments.bulk_load(comments_of("arthur", 60), max_workers=1)
+
+        assert sizes == [25, 25, 10]
+
+    def test_duplicate_keys_in_a_request_are_written_once(self, comments):
+        first, = comments_of("polly", 1)
+        last = first._replace(text="edited")
+
+        report = comments.bulk_load([first, last])
+
+        assert report.items == 1
+        assert comments.get_comment("polly", first.datetime) == last
+
+    def test_unprocessed_items_are_retried(self, comments, dynamo,
+                                           monkeypatch):
+        client = dynamo.meta.client
+        batch_write_item = client.batch_write_item
+        calls = []
+
+        def throttling_batch_write_item(RequestItems):
+            calls.append(RequestItems)
+
+            if len(calls) > 1:
+                return batch_write_item(RequestItems=RequestItems)
+
+            (name, requests), = RequestItems.items()
+            batch_write_item(RequestItems={name: requests[:1]})
+
+            return {"UnprocessedItems": {name: requests[1:]}}
+
+        monkeypatch.setattr(client, "batch_write_item",
+                            throttling_batch_write_item)
+
+        report = comments.bulk_load(comments_of("john", 3), base_delay=0)
+
+        assert report.items == 3
+        assert len(calls) == 2
+        assert len(comments.query("john")) == 3
+
+    def test_items_left_unprocessed_are_reported(self, comments, dynamo,
+                                                 monkeypatch):
+        def rejecting_batch_write_item(RequestItems):
+            return {"UnprocessedItems": RequestItems}
+
+        monkeypatch.setattr(dynamo.meta.client, "batch_write_item",
+                            rejecting_batch_write_item)
+
+        report = comments.bulk_load(comments_of("ada", 30),
+                                    max_attempts=2,
+                                    base_delay=0)
+
+        assert report.items == 0
+        assert report.failed == 30
+
+
+class TestIterQuery:
+    @pytest.fixture
+    def history(self, comments):
+        loaded = comments_of("thomasshelby", 10)
+        comments.bulk_load(loaded + comments_of("arthur", 3))
+
+        return loaded
+
+    def test_all_pages_are_read(self, comments, history, dynamo,
+                                monkeypatch):
+        client = dynamo.meta.client
+        query = client.query
+        calls = []
+
+        def recording_query(**kwargs):
+            calls.append(kwargs)
+            return query(**kwargs)
+
+        monkeypatch.setattr(client, "query", recording_query)
+
+        assert list(comments.iter_query("thomasshelby",
+                                        page_size=3)) == history
+        assert len(calls) == 4
+
+    def test_comments_are_read_lazily(self, comments, history):
+        query = comments.iter_query("thomasshelby", page_size=2)
+
+        assert next(query) == history[0]
+
+    def test_range_conditions(self, comments, history):
+        since, until = history[2].datetime, history[5].datetime
+
+        assert (list(comments.iter_query("thomasshelby", since=since)) ==
+                history[2:])
+        assert (list(comments.iter_query("thomasshelby", until=until)) ==
+                history[:6])
+        assert list(comments.iter_query("thomasshelby",
+                                        since=since,
+                                        until=until)) == history[2:6]
+
+    def test_descending_order(self, comments, history):
+        assert (list(comments.iter_query("thomasshelby", descending=True)) ==
+                history[::-1])
+
+    def test_projection_keeps_the_key(self, comments, history):
+        assert list(comments.iter_query("thomasshelby", attributes=[])) == [
+            c._replace(text="") for c in history
+        ]
+
+    def test_query_returns_all_comments(self, comments, history):
+        assert comments.query("thomasshelby") == history
+
+
+def test_errors_of_generators_are_wrapped():
+    @ddberror.wrap_client_error
+    def failing():
+        yield 1
+        raise ClientError({"Error": {"Code": "ValidationException",
+                                     "Message": "Bad"}},
+                          "Query")
+
+    items = failing()
+
+    assert next(items) == 1
+
+    with pytest.raises(ddberror.Error):
+        next(items)
+
+
+class TestScanAll:
+    @pytest.fixture
+    def loaded(self, comments):
+        loaded = comments_of("thomasshelby", 40) + comments_of("polly", 25)
+        comments.bulk_load(loaded)
+
+        return loaded
+
+    @staticmethod
+    def sorted_comments(comments):
+        return sorted(comments, key=lambda c: (c.username, c.datetime))
+
+    def test_all_comments_are_read(self, comments, loaded):
+        scanned = list(comments.scan_all(segments=3, page_size=7))
+
+        assert self.sorted_comments(scanned) == self.sorted_comments(loaded)
+
+    def test_segments_must_be_positive(self, comments):
+        with pytest.raises(ValueError):
+            comments.scan_all(segments=0)
+
+    def test_closing_the_iterator_stops_the_segments(self, comments, loaded):
+        threads = threading.active_count()
+        scanned = comments.scan_all(segments=4, page_size=1)
+        next(scanned)
+
+        scanned.close()
+
+        assert threading.active_count() == threads
+
+    def test_capacity_is_paced(self, comments, loaded):
+        start = time.monotonic()
+
+        list(comments.scan_all(segments=2, max_rcu=20, page_size=10))
+
+        # Each of the 7 or more pages consumes at least 1 RCU
+        assert time.monotonic() - start >= 0.25
+
+
+def test_capacity_pacer():
+    now = [0.0]
+    pacer = _CapacityPacer(10, clock=lambda: now[0])
+
+    assert pacer.reserve(5) == pytest.approx(0.5)
+    assert pacer.reserve(5) == pytest.approx(1.0)
+
+    now[0] = 3.0
+
+    assert pacer.reserve(1) == pytest.approx(0.1)
+
+
+def test_dump_jsonl(comments, tmp_path):
+    loaded = comments_of("ada", 3)
+    comments.bulk_load(loaded)
+    path = tmp_path / "comments.jsonl"
+
+    assert dump_jsonl(comments.scan_all(segments=2), path) == 3
+
+    lines = [json.loads(l) for l in path.read_text("utf-8").splitlines()]
+
+    assert sorted(l["text"] for l in lines) == ["c0", "c1", "c2"]
+
+
+class TestGetComments:
+    @pytest.fixture
+    def loaded(self, comments):
+        loaded = comments_of("thomasshelby", 150)
+        comments.bulk_load(loaded)
+
+        return loaded
+
+    def test_comments_are_returned_in_order_of_keys(self, comments, loaded):
+        keys = [(c.username, c.datetime) for c in loaded[::-1]]
+
+        assert comments.get_comments(keys) == loaded[::-1]
+
+    def test_none_is_returned_for_missing_comments(self, comments, loaded):
+        missing = ("arthur", loaded[0].datetime)
+        keys = [missing, (loaded[1].username, loaded[1].datetime), missing]
+
+        assert comments.get_comments(keys) == [None, loaded[1], None]
+
+    def test_keys_are_requested_once_in_chunks_of_100(self, comments, loaded,
+                                                      dynamo, monkeypatch):
+        client = dynamo.meta.client
+        batch_get_item = client.batch_get_item
+        sizes = []
+
+        def recording_batch_get_item(RequestItems):
+            sizes.extend(len(r["Keys"]) for r in RequestItems.values())
+            return batch_get_item(RequestItems=RequestItems)
+
+        monkeypatch.setattr(client, "batch_get_item",
+                            recording_batch_get_item)
+        keys = [(c.username, c.datetime) for c in loaded]
+
+        assert comments.get_comments(keys + keys) == loaded + loaded
+        assert sorted(sizes) == [50, 100]
+
+    def test_unprocessed_keys_are_retried(self, comments, loaded, dynamo,
+                                          monkeypatch):
+        client = dynamo.meta.client
+        batch_get_item = client.batch_get_item
+        calls = []
+
+        def throttling_batch_get_item(RequestItems):
+            calls.append(RequestItems)
+            (name, request), = RequestItems.items()
+
+            if len(calls) > 1:
+                return batch_get_item(RequestItems=RequestItems)
+
+            response = batch_get_item(
+                RequestItems={name: {"Keys": request["Keys"][:1]}}
+            )
+            response["UnprocessedKeys"] = {
+                name: {"Keys": request["Keys"][1:]}
+            }
+
+            return response
+
+        monkeypatch.setattr(client, "batch_get_item",
+                            throttling_batch_get_item)
+        keys = [(c.username, c.datetime) for c in loaded[:3]]
+
+        assert comments.get_comments(keys, base_delay=0) == loaded[:3]
+        assert len(calls) == 2
+
+    def test_error_is_raised_for_keys_left_unprocessed(self, comments,
+                                                       dynamo, monkeypatch):
+        def rejecting_batch_get_item(RequestItems):
+            return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+        monkeypatch.setattr(dynamo.meta.client, "batch_get_item",
+                            rejecting_batch_get_item)
+
+        with pytest.raises(ddberror.Error):
+            comments.get_comments([("ada", dt.datetime.now())],
+                                  max_attempts=2,
+                                  base_delay=0)
+
+    def test_no_keys(self, comments):
+        assert comments.get_comments([]) == []
+
+
+class TestCache:
+    @pytest.fixture
+    def cache(self):
+        return LRUCache(max_size=100, ttl=60)
+
+    @pytest.fixture
+    def comments(self, dynamo, cache):
+        return Comments(dynamo, cache=cache)
+
+    @pytest.fixture
+    def get_item_calls(self, dynamo, monkeypatch):
+        client = dynamo.meta.client
+        get_item = client.get_item
+        calls = []
+
+        def recording_get_item(**kwargs):
+            calls.append(kwargs)
+            return get_item(**kwargs)
+
+        monkeypatch.setattr(client, "get_item", recording_get_item)
+
+        return calls
+
+    def test_comments_are_read_through_the_cache(self, comments, cache,
+                                                 get_item_calls):
+        comment, = comments_of("polly", 1)
+        comments.bulk_load([comment])
+
+        assert comments.get_comment("polly", comment.datetime) == comment
+        assert comments.get_comment("polly", comment.datetime) == comment
+        assert len(get_item_calls) == 1
+        assert cache.stats().hit_rate == pytest.approx(0.5)
+
+    def test_missing_comments_are_cached(self, comments, get_item_calls):
+        datetime = dt.datetime.fromtimestamp(1692249109)
+
+        assert comments.get_comment("polly", datetime) is None
+        assert comments.get_comment("polly", datetime) is None
+        assert len(get_item_calls) == 1
+
+    def test_writes_go_through_the_cache(self, comments, get_item_calls):
+        comment, = comments_of("polly", 1)
+        comments.add_comment(comment)
+
+        assert comments.get_comment("polly", comment.datetime) == comment
+
+        updated = comments.update_comment("polly", comment.datetime, "new")
+
+        assert comments.get_comment("polly", comment.datetime) == updated
+
+        comments.delete_comment("polly", comment.datetime)
+
+        assert comments.get_comment("polly", comment.datetime) is None
+        assert get_item_calls == []
+
+    def test_queries_are_cached_and_invalidated(self, comments, dynamo,
+                                                monkeypatch):
+        history = comments_of("john", 3)
+        comments.bulk_load(history[:2])
+        client = dynamo.meta.client
+        query = client.query
+        calls = []
+
+        def recording_query(**kwargs):
+            calls.append(kwargs)
+            return query(**kwargs)
+
+        monkeypatch.setattr(client, "query", recording_query)
+
+        assert comments.query("john") == history[:2]
+        assert comments.query("john") == history[:2]
+        assert len(calls) == 1
+
+        comments.add_comment(history[2])
+
+        assert comments.query("john") == history
+        assert len(calls) == 2
+
+    def test_bulk_loads_invalidate_entries(self, comments):
+        comment, = comments_of("ada", 1)
+        comments.get_comment("ada", comment.datetime)
+
+        comments.bulk_load([comment])
+
+        assert comments.get_comment("ada", comment.datetime) == comment
+
+    def test_batch_gets_use_the_cache(self, comments, dynamo, monkeypatch):
+        loaded = comments_of("arthur", 3)
+        comments.bulk_load(loaded)
+        comments.get_comment("arthur", loaded[0].datetime)
+        client = dynamo.meta.client
+        batch_get_item = client.batch_get_item
+        requested = []
+
+        def recording_batch_get_item(RequestItems):
+            requested.extend(k for r in RequestItems.values()
+                             for k in r["Keys"])
+            return batch_get_item(RequestItems=RequestItems)
+
+        monkeypatch.setattr(client, "batch_get_item",
+                            recording_batch_get_item)
+        keys = [(c.username, c.datetime) for c in loaded]
+
+        assert comments.get_comments(keys) == loaded
+        assert comments.get_comments(keys) == loaded
+        assert len(requested) == 2
@@ -0,0 +1,37 @@
+from translation import Language
+from translation.detection import guess_language
+
+
+def test_bulgarian_cyrillic_text_is_not_guessed():
+    assert guess_language("Здравей, млади господине!") is None
+
+
+def test_russian_cyrillic_text_is_not_guessed():
+    assert guess_language("Это большой кот") is None
+    assert guess_language("Привет, как дела?") is None
+
+
+def test_ukrainian_cyrillic_text_is_not_guessed():
+    assert guess_language("Добрий день, друже") is None
+
+
+def test_serbian_cyrillic_text_is_not_guessed():
+    assert guess_language("Здраво, како си?") is None
+
+
+def test_latin_text_is_not_guessed():
+    assert guess_language("hello young sir") is None
+
+
+def test_mixed_latin_and_cyrillic_text_is_not_guessed():
+    assert guess_language("Здравей, sir") is None
+
+
+def test_text_in_unsupported_script_is_other():
+    assert guess_language("Καλημέρα κόσμε") is Language.OTHER
+    assert guess_language("你好世界") is Language.OTHER
+
+
+def test_text_without_letters_is_not_guessed():
+    assert guess_language("123 !?") is None
+    assert guess_language("") is None
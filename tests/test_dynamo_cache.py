@@ -0,0 +1,144 @@
+import pytest
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+import translation as tr
+from translation.cache import translation_key
+from translation.dynamo_cache import DynamoCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def dynamo(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+
+    with moto.mock_aws():
+        yield boto3.resource("dynamodb", region_name="us-east-1")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(dynamo, clock):
+    return DynamoCache(dynamo, ttl=60, clock=clock)
+
+
+def key_of(body):
+    return translation_key(body, tr.Language.DE, tr.Language.EN)
+
+
+class TestDynamoCache:
+    def test_table_is_created_with_ttl(self, cache, dynamo):
+        description = dynamo.meta.client.describe_time_to_live(
+            TableName="Translations"
+        )["TimeToLiveDescription"]
+
+        assert description["AttributeName"] == "expires_at"
+        assert description["TimeToLiveStatus"] == "ENABLED"
+
+    def test_existing_table_is_loaded(self, cache, dynamo, clock):
+        cache.put_many({key_of("a"): "A"})
+
+        assert DynamoCache(dynamo, clock=clock).get_many([key_of("a")]) == {
+            key_of("a"): "A"
+        }
+
+    def test_stored_translations_are_found(self, cache):
+        cache.put_many({key_of(b): b.upper() for b in ("a", "b")})
+
+        assert cache.get_many([key_of("a"), key_of("c"), key_of("b")]) == {
+            key_of("a"): "A", key_of("b"): "B"
+        }
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.writes) == (2, 1, 2)
+
+    def test_keys_differ_by_language_pair(self, cache):
+        cache.put_many({key_of("a"): "A"})
+
+        assert cache.get_many(
+            [translation_key("a", tr.Language.DE, tr.Language.FR)]
+        ) == {}
+
+    def test_expired_translations_are_not_returned(self, cache, clock):
+        cache.put_many({key_of("a"): "A"})
+
+        clock.now += 61
+
+        assert cache.get_many([key_of("a")]) == {}
+
+    def test_requests_are_batched(self, cache, dynamo, monkeypatch):
+        client = dynamo.meta.client
+        batch_get_item = client.batch_get_item
+        sizes = []
+
+        def recording_batch_get_item(RequestItems):
+            sizes.extend(len(r["Keys"]) for r in RequestItems.values())
+            return batch_get_item(RequestItems=RequestItems)
+
+        monkeypatch.setattr(client, "batch_get_item",
+                            recording_batch_get_item)
+        keys = [key_of(str(i)) for i in range(150)]
+        cache.put_many(dict.fromkeys(keys, "x"))
+
+        assert len(cache.get_many(keys)) == 150
+        assert sizes == [100, 50]
+        assert cache.stats().writes == 150
+
+    def test_failed_requests_are_misses(self, cache, dynamo, monkeypatch):
+        def failing(**kwargs):
+            raise dynamo.meta.client.exceptions.ResourceNotFoundException(
+                {"Error": {"Code": "ResourceNotFoundException",
+                           "Message": "Gone"}},
+                "BatchGetItem"
+            )
+
+        monkeypatch.setattr(dynamo.meta.client, "batch_get_item", failing)
+        monkeypatch.setattr(dynamo.meta.client, "batch_write_item", failing)
+
+        cache.put_many({key_of("a"): "A"})
+
+        assert cache.get_many([key_of("a")]) == {}
+        assert cache.stats().errors == 2
+
+
+class TestTranslatorWithDynamoCache:
+    def test_translations_are_shared_between_translators(self, cache):
+        first_backend = tr.FakeBackend()
+        second_backend = tr.FakeBackend()
+        texts = [tr.Text("a", tr.Language.DE), tr.Text("b", tr.Language.DE)]
+
+        first = tr.Translator(backend=first_backend, shared_cache=cache)
+        second = tr.Translator(backend=second_backend,
+                               cache=tr.LRUCache(),
+                               shared_cache=cache)
+
+        assert (first.translate_many(texts) ==
+                second.translate_many(texts) ==
+                ["a (de->en)", "b (de->en)"])
+        assert second_backend.calls == []
+        assert second.stats().cache.size == 2
+        assert second.stats().shared_cache.hits == 2
+
+    def test_failed_translations_are_not_stored(self, cache):
+        translator = tr.Translator(
+            backend=tr.FakeBackend(fail_on=["a"], error=TimeoutError),
+            shared_cache=cache
+        )
+
+        translator.translate_many([tr.Text("a", tr.Language.DE)])
+
+        assert cache.get_many([key_of("a")]) == {}
@@ -1,7 +1,12 @@
 import base64
+import copy
+import json
+import time
+
+import pytest
 
 from translation import handler as hr
-from translation import Language
+from translation import FakeBackend, Language, Metrics, TextBatch, Translator
 
 
 class TestEventType:
@@ -11,6 +16,10 @@ class TestEventType:
     def test_from_invalid_name_returns_custom(self):
         assert hr.EventType.from_string("invalid") is hr.EventType.CUSTOM
 
+    def test_from_name_in_any_case(self):
+        assert hr.EventType.from_string("Kinesis") is hr.EventType.KINESIS
+        assert hr.EventType.from_string("sQs") is hr.EventType.SQS
+
 
 class TestCreateLanguage:
     def test_none_is_returned_for_none(self):
@@ -73,6 +82,13 @@ class TestTextRetrieval:
     def test_texts_from_for_kinesis(self, kinesis_event, kinesis_text):
         assert hr._texts_from(kinesis_event) == kinesis_text
 
+    def test_text_batch_from_for_sqs(self, sqs_event, sqs_text):
+        assert hr._text_batch_from(sqs_event) == TextBatch.from_texts(sqs_text)
+
+    def test_text_batch_from_for_kinesis(self, kinesis_event, kinesis_text):
+        assert (hr._text_batch_from(kinesis_event) ==
+                TextBatch.from_texts(kinesis_text))
+
 
 class TestLambdaHandler:
     def test_for_sns(self, sns_event, sns_translation, translator):
@@ -106,3 +122,188 @@ class TestDecodeKinesisData:
         assert hr._decode_kinesis_data(
             encoded_data
         ) == original_data
+
+    def test_from_json(self):
+        original_data = {"text": "Hello there", "from_language": "EN"}
+        encoded_data = base64.b64encode(
+            f" {json.dumps(original_data)}\n".encode("utf-8")
+        )
+
+        assert hr._decode_kinesis_data(encoded_data) == original_data
+
+    def test_from_non_dictionary_literal(self):
+        encoded_data = base64.b64encode(b"{1, 2}")
+
+        assert hr._decode_kinesis_data(
+            encoded_data
+        ) == {"text": "{1, 2}"}
+
+    @pytest.mark.parametrize("data", [
+        b'{"text": null}',
+        b'{"text": true, "to_language": "DE"}',
+        b"{'text': 1}",
+    ])
+    def test_from_dictionary_without_text(self, data):
+        encoded_data = base64.b64encode(data)
+
+        assert hr._decode_kinesis_data(
+            encoded_data
+        ) == {"text": data.decode("utf-8")}
+
+    def test_record_with_null_text_is_translated_as_raw_text(
+            self, kinesis_event):
+        kinesis_event["Records"][0]["kinesis"]["data"] = base64.b64encode(
+            b'{"text": null}'
+        ).decode("ascii")
+        translator = Translator(backend=FakeBackend())
+
+        response = hr.handle_event(kinesis_event, translator)
+
+        assert response.translation[0] == ('{"text": null}',
+                                           '{"text": null} (en->en)')
+
+    def test_from_malformed_dictionary(self):
+        encoded_data = base64.b64encode(b"{ not a dict }")
+
+        assert hr._decode_kinesis_data(
+            encoded_data
+        ) == {"text": "{ not a dict }"}
+
+
+class TestStream:
+    def test_records_are_decoded_lazily(self, kinesis_event):
+        event = {"Records": kinesis_event["Records"] + [{"malformed": 1}]}
+        translator = Translator(backend=FakeBackend())
+
+        pairs = hr.stream(event, translator, window=1)
+
+        assert next(pairs) == ("Hallo zusammen", "Hallo zusammen (de->en)")
+        assert next(pairs) == ("Le chat est grand",
+                               "Le chat est grand (en->en)")
+
+        with pytest.raises(KeyError):
+            next(pairs)
+
+    def test_windows_give_the_same_pairs(self, sqs_event):
+        translator = Translator(backend=FakeBackend())
+
+        assert (
+            hr.lambda_handler(sqs_event, translator, window=1) ==
+            hr.lambda_handler(sqs_event, translator)
+        )
+
+
+class TestHandleEvent:
+    @pytest.mark.parametrize("batches_natively", [False, True])
+    def test_only_failed_sqs_messages_are_reported(self,
+                                                   sqs_event,
+                                                   batches_natively):
+        record = sqs_event["Records"][0]
+        sqs_event["Records"] = [
+            {**copy.deepcopy(record), "body": f"SQS {i}", "messageId": str(i)}
+            for i in range(5)
+        ]
+        translator = Translator(
+            backend=FakeBackend(fail_on=["SQS 2"],
+                                error=TimeoutError,
+                                batches_natively=batches_natively)
+        )
+
+        response = hr.handle_event(sqs_event, translator)
+
+        assert response.translation == [
+            (f"SQS {i}", f"SQS {i} (en->fr)" if i != 2 else None)
+            for i in range(5)
+        ]
+        assert response.batch_item_failures == [{"itemIdentifier": "2"}]
+
+    def test_failed_kinesis_records_are_reported(self, kinesis_event):
+        translator = Translator(
+            backend=FakeBackend(error_rate=1, error=ConnectionError)
+        )
+
+        response = hr.handle_event(kinesis_event, translator)
+
+        assert response.batch_item_failures == [
+            {"itemIdentifier": r["kinesis"]["sequenceNumber"]}
+            for r in kinesis_event["Records"]
+        ]
+
+    def test_untranslatable_records_are_not_retried(self, sqs_event):
+        sqs_event["Records"][0]["messageAttributes"]["to_language"][
+            "Value"
+        ] = "PL"
+        translator = Translator(backend=FakeBackend())
+
+        response = hr.handle_event(sqs_event, translator)
+
+        assert response.translation[0][1] is None
+        assert response.batch_item_failures == []
+
+    def test_failures_are_not_reported_for_custom_events(self, custom_event):
+        custom_event["to_language"] = "PL"
+        translator = Translator(backend=FakeBackend())
+
+        response = hr.handle_event(custom_event, translator)
+
+        assert response.translation == [("Custom text", None)]
+        assert response.batch_item_failures is None
+
+    def test_failed_custom_events_raise(self, custom_event):
+        translator = Translator(backend=FakeBackend(error_rate=1,
+                                                    error=TimeoutError))
+
+        with pytest.raises(hr.TranslationFailed) as e:
+            hr.handle_event(custom_event, translator)
+
+        assert isinstance(e.value.__cause__, TimeoutError)
+
+    def test_sns_events_past_the_deadline_raise(self, sns_event):
+        translator = Translator(backend=FakeBackend())
+
+        with pytest.raises(hr.TranslationFailed):
+            hr.handle_event(sns_event,
+                            translator,
+                            deadline=time.monotonic() - 1)
+
+    def test_records_left_at_the_deadline_are_reported(self, sqs_event):
+        translator = Translator(backend=FakeBackend())
+
+        response = hr.handle_event(sqs_event,
+                                   translator,
+                                   deadline=time.monotonic() - 1)
+
+        assert [t for _, t in response.translation] == [None, None]
+        assert response.batch_item_failures == [
+            {"itemIdentifier": r["messageId"]} for r in sqs_event["Records"]
+        ]
+
+    def test_compact_translation_is_keyed_by_record_id(self, sqs_event):
+        translator = Translator(backend=FakeBackend())
+
+        response = hr.handle_event(sqs_event, translator, window=1)
+
+        assert response.compact_translation() == {
+            r["messageId"]: t
+            for r, (_, t) in zip(sqs_event["Records"], response.translation)
+        }
+
+    def test_compact_translation_of_custom_event_is_keyed_by_index(
+            self, custom_event):
+        translator = Translator(backend=FakeBackend())
+
+        response = hr.handle_event(custom_event, translator)
+
+        assert response.compact_translation() == {
+            "0": response.translation[0][1]
+        }
+
+    def test_stages_are_recorded_in_the_metrics(self, sqs_event):
+        metrics = Metrics()
+        translator = Translator(backend=FakeBackend(), metrics=metrics)
+
+        hr.handle_event(sqs_event, translator, window=1)
+
+        snapshot = metrics.snapshot()
+        assert snapshot.items == 2
+        assert all(snapshot.stages[s] > 0 for s in ("parse", "respond"))
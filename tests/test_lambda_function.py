@@ -0,0 +1,231 @@
+import io
+import json
+import time
+
+import pytest
+
+import lambda_function as lf
+import translation as tr
+
+
+class FakeContext:
+    function_name = "poli-translator"
+    function_version = "$LATEST"
+    aws_request_id = "request-1"
+
+    def __init__(self, remaining_time_in_millis=60_000):
+        self.__remaining_time_in_millis = remaining_time_in_millis
+
+    def get_remaining_time_in_millis(self):
+        return self.__remaining_time_in_millis
+
+
+class RecordingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, s):
+        self.writes.append(s)
+
+        return super().write(s)
+
+
+@pytest.fixture
+def backend():
+    return tr.FakeBackend()
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch, backend):
+    metrics = tr.Metrics()
+    monkeypatch.setattr(lf, "metrics", metrics)
+    monkeypatch.setattr(lf, "translator",
+                        tr.Translator(backend=backend, metrics=metrics))
+    monkeypatch.setattr(lf, "response_mode", "full")
+    monkeypatch.setattr(lf, "blob_store", None)
+    monkeypatch.setattr(lf, "log_mode", tr.LogMode.VERBOSE)
+    monkeypatch.setattr(lf, "deadline_margin", 15.0)
+
+
+class TestResponse:
+    def test_full_response_has_pairs_and_python_version(self, sqs_event):
+        result = lf.lambda_handler(sqs_event, FakeContext())
+
+        assert result["py-version"] == lf.sys.version_info
+        assert result["func-name"] == "poli-translator"
+        assert result["translation"] == [
+            ("Hello, this is SQS 1", "Hello, this is SQS 1 (en->fr)"),
+            ("Hello, this is SQS 2", "Hello, this is SQS 2 (en->fr)"),
+        ]
+        assert result["batchItemFailures"] == []
+
+    def test_compact_response_is_keyed_by_record_id(self,
+                                                    monkeypatch,
+                                                    sqs_event):
+        monkeypatch.setattr(lf, "response_mode", "compact")
+
+        result = lf.lambda_handler(sqs_event, FakeContext())
+
+        assert "py-version" not in result
+        assert result["translation"] == {
+            r["messageId"]: f"{r['body']} (en->fr)"
+            for r in sqs_event["Records"]
+        }
+
+    def test_failed_records_are_reported(self, monkeypatch, sqs_event):
+        failing = sqs_event["Records"][1]
+        monkeypatch.setattr(lf, "translator", tr.Translator(
+            backend=tr.FakeBackend(fail_on=[failing["body"]],
+                                   error=ConnectionError)
+        ))
+
+        result = lf.lambda_handler(sqs_event, FakeContext())
+
+        assert result["batchItemFailures"] == [
+            {"itemIdentifier": failing["messageId"]}
+        ]
+
+    def test_failures_are_not_reported_for_custom_events(self, custom_event):
+        assert "batchItemFailures" not in lf.lambda_handler(custom_event,
+                                                            FakeContext())
+
+
+class TestSpill:
+    def test_large_translation_is_spilled(self,
+                                          monkeypatch,
+                                          tmp_path,
+                                          sqs_event):
+        store = tr.LocalBlobStore(tmp_path)
+        monkeypatch.setattr(lf, "blob_store", store)
+        monkeypatch.setattr(lf, "response_mode", "compact")
+        monkeypatch.setattr(lf, "max_response_bytes", 10)
+
+        result = lf.lambda_handler(sqs_event, FakeContext())
+
+        assert "translation" not in result
+        assert json.loads(store.get(result["translation-ref"])) == {
+            r["messageId"]: f"{r['body']} (en->fr)"
+            for r in sqs_event["Records"]
+        }
+        assert result["translation-ref"].endswith("/request-1.json")
+
+    def test_small_translation_is_returned(self,
+                                           monkeypatch,
+                                           tmp_path,
+                                           sqs_event):
+        monkeypatch.setattr(lf, "blob_store", tr.LocalBlobStore(tmp_path))
+
+        result = lf.lambda_handler(sqs_event, FakeContext())
+
+        assert len(result["translation"]) == 2
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "plain",
+        'quotes " and \\ and \n',
+        "\x00\x1f",
+        "кирилица",
+        "emoji 😀😀",
+        [("a", None), ("б", "😀")],
+        {"id": "\x01", "друго": None},
+    ])
+    def test_json_size_bound_is_an_upper_bound(self, value):
+        assert lf.json_size_bound(value) >= len(json.dumps(value).encode())
+
+
+class TestDeadline:
+    def test_deadline_leaves_the_margin(self):
+        deadline = lf.deadline_of(FakeContext(remaining_time_in_millis=60_000))
+
+        assert deadline == pytest.approx(time.monotonic() + 45, abs=0.5)
+
+    def test_margin_is_at_most_half_of_the_remaining_time(self):
+        deadline = lf.deadline_of(FakeContext(remaining_time_in_millis=3_000))
+
+        assert deadline == pytest.approx(time.monotonic() + 1.5, abs=0.5)
+
+    def test_event_is_translated_with_the_default_timeout(self, custom_event):
+        result = lf.lambda_handler(
+            custom_event,
+            FakeContext(remaining_time_in_millis=2_950)
+        )
+
+        assert result["translation"][0][1] is not None
+
+    def test_records_left_at_the_deadline_are_reported(self,
+                                                       backend,
+                                                       sqs_event):
+        result = lf.lambda_handler(
+            sqs_event,
+            FakeContext(remaining_time_in_millis=0)
+        )
+
+        assert backend.calls == []
+        assert result["batchItemFailures"] == [
+            {"itemIdentifier": r["messageId"]} for r in sqs_event["Records"]
+        ]
+
+    def test_custom_events_left_at_the_deadline_fail(self, custom_event):
+        with pytest.raises(tr.TranslationFailed):
+            lf.lambda_handler(custom_event,
+                              FakeContext(remaining_time_in_millis=0))
+
+
+class TestSharedCache:
+    @pytest.fixture
+    def aws(self, monkeypatch):
+        moto = pytest.importorskip("moto")
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        monkeypatch.delenv("AWS_PROFILE", raising=False)
+
+        with moto.mock_aws():
+            yield
+
+    def test_shared_cache_is_created(self, aws):
+        shared_cache = lf.create_shared_cache("Translations")
+
+        assert shared_cache.name == "Translations"
+
+    def test_function_runs_without_a_shared_cache_it_cant_create(
+            self, aws, monkeypatch, capsys):
+        from botocore.exceptions import ClientError
+
+        def denied(*args, **kwargs):
+            raise ClientError(
+                {"Error": {"Code": "AccessDeniedException",
+                           "Message": "denied"}},
+                "DescribeTable"
+            )
+
+        monkeypatch.setattr(tr, "DynamoCache", denied)
+
+        assert lf.create_shared_cache("Translations") is None
+        assert "AccessDeniedException" in capsys.readouterr().out
+
+
+class TestLogging:
+    def test_results_are_logged_with_one_write(self, monkeypatch):
+        stdout = RecordingStream()
+        monkeypatch.setattr(lf.sys, "stdout", stdout)
+
+        lf.log_results([("a", "b"), ("c", None)])
+
+        assert stdout.writes == [
+            "ITEM  1\nOriginal: a\nTranslation: b\n"
+            "ITEM  2\nOriginal: c\nTranslation: None\n"
+        ]
+
+    def test_metrics_are_emitted_as_emf(self, capsys, sqs_event):
+        lf.lambda_handler(sqs_event, FakeContext())
+
+        record = json.loads(capsys.readouterr().out.splitlines()[-1])
+
+        assert record["FunctionName"] == "poli-translator"
+        assert record["Items"] == 2
+        assert record["_aws"]["CloudWatchMetrics"][0]["Namespace"] == (
+            lf.metrics_namespace
+        )
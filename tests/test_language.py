@@ -7,3 +7,30 @@ def test_creating_supported_language():
 
 def test_creating_unsupported_language_returns_other():
     assert Language.from_string("zz") is Language.OTHER
+
+
+def test_creating_language_is_case_insensitive():
+    assert Language.from_string("De") is Language.DE
+    assert Language.from_string("fR") is Language.FR
+
+
+def test_creating_language_from_iso_639_2_code():
+    assert Language.from_string("eng") is Language.EN
+    assert Language.from_string("ger") is Language.DE
+
+
+def test_creating_language_from_name():
+    assert Language.from_string("English") is Language.EN
+    assert Language.from_string("français") is Language.FR
+    assert Language.from_string("български") is Language.BG
+
+
+def test_creating_language_from_bcp_47_tag():
+    assert Language.from_string("en-US") is Language.EN
+    assert Language.from_string("bg_BG") is Language.BG
+    assert Language.from_string("es-419") is Language.ES
+
+
+def test_uncommon_regions_fall_back_to_primary_subtag():
+    assert Language.from_string("de-LU") is Language.DE
+    assert Language.from_string("pl-PL") is Language.OTHER
@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from translation import Language
+from translation.metrics import Metrics, timed
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stages_are_timed():
+    clock = FakeClock()
+    metrics = Metrics(clock=clock)
+
+    with metrics.time("parse"):
+        clock.now = 1.5
+
+    with timed(metrics, "parse"):
+        clock.now = 2.0
+
+    assert metrics.snapshot().stages == {
+        "parse": 2.0, "detect": 0.0, "translate": 0.0, "respond": 0.0
+    }
+
+
+def test_timed_without_metrics_does_nothing():
+    with timed(None, "parse"):
+        pass
+
+
+def test_batches_are_counted_per_language_pair():
+    metrics = Metrics()
+    metrics.add_batch(Language.DE, Language.EN, 3)
+    metrics.add_batch(Language.DE, Language.EN, 30)
+    metrics.add_batch(Language.FR, Language.BG, 1)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot.pairs == {"de->en": 33, "fr->bg": 1}
+    assert snapshot.batch_sizes.count == 3
+    assert snapshot.batch_sizes.mean == pytest.approx(34 / 3)
+    assert dict(snapshot.batch_sizes.buckets)[5] == 1
+
+
+def test_backend_latency_histogram():
+    metrics = Metrics()
+
+    for seconds in (0.004, 0.02, 0.02, 30):
+        metrics.add_backend_call(seconds)
+
+    latency = metrics.snapshot().backend_latency
+
+    assert (latency.count, latency.minimum, latency.maximum) == (
+        4, pytest.approx(4), pytest.approx(30000)
+    )
+    assert dict(latency.buckets) == {
+        5: 1, 10: 0, 25: 2, 50: 0, 100: 0, 250: 0, 500: 0, 1000: 0,
+        2500: 0, 5000: 0, 10000: 0, float("inf"): 1
+    }
+
+
+def test_reset_forgets_measurements():
+    metrics = Metrics()
+    metrics.add_items(3)
+    metrics.add_backend_call(1)
+
+    metrics.reset()
+
+    snapshot = metrics.snapshot()
+    assert snapshot.items == 0
+    assert snapshot.backend_latency.count == 0
+
+
+def test_emf_record():
+    metrics = Metrics()
+    metrics.add_items(2)
+    metrics.add_batch(Language.DE, Language.EN, 2)
+    metrics.add_backend_call(0.012)
+
+    record = metrics.to_emf("Namespace",
+                            {"FunctionName": "f"},
+                            timestamp=1.5)
+
+    directive, = record["_aws"]["CloudWatchMetrics"]
+    names = [m["Name"] for m in directive["Metrics"]]
+
+    assert record["_aws"]["Timestamp"] == 1500
+    assert directive["Namespace"] == "Namespace"
+    assert directive["Dimensions"] == [["FunctionName"]]
+    assert record["FunctionName"] == "f"
+    assert all(name in record for name in names)
+    assert {"ParseTime", "RespondTime", "Items", "BatchSize",
+            "BackendLatency", "BackendCalls"} <= set(names)
+    assert record["BatchSize"] == [2]
+    assert record["BackendLatency"] == [12.0]
+    assert record["LanguagePairs"] == {"de->en": 2}
+    assert record["BackendLatencyHistogram"]["le_25"] == 1
+
+
+def test_emf_record_without_backend_calls_has_no_histogram_metrics():
+    names = [m["Name"]
+             for m in Metrics().to_emf("N")["_aws"]["CloudWatchMetrics"][0][
+                 "Metrics"
+             ]]
+
+    assert "BackendLatency" not in names
+    assert "BatchSize" not in names
+
+
+def test_latency_samples_cover_all_calls():
+    metrics = Metrics(rng=random.Random(0))
+
+    for i in range(10_000):
+        metrics.add_backend_call(i / 1000)
+
+    samples = metrics.snapshot().backend_latency.samples
+
+    assert len(samples) == 100
+    assert len(set(samples)) == 100
+    assert max(samples) > 5000
+    assert 3000 < sum(samples) / len(samples) < 7000
+
+
+def test_first_values_are_all_sampled():
+    metrics = Metrics()
+
+    for size in range(1, 51):
+        metrics.add_batch(Language.DE, Language.EN, size)
+
+    assert metrics.snapshot().batch_sizes.samples == tuple(range(1, 51))
@@ -0,0 +1,76 @@
+import http.server
+import threading
+
+import pytest
+
+from translation.pool import ConnectionPool, PoolStats
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestConstructor:
+    def test_max_connections_must_be_positive(self):
+        with pytest.raises(ValueError):
+            ConnectionPool(max_connections=0)
+
+    def test_max_keepalive_defaults_to_max_connections(self):
+        assert ConnectionPool(max_connections=4).max_keepalive == 4
+
+    def test_stats_are_empty_before_first_use(self):
+        assert ConnectionPool().stats() == PoolStats(0, 0, 0)
+
+
+class TestConnectionReuse:
+    def test_connection_is_reused_across_requests(self, server_url):
+        pool = ConnectionPool(http2=False)
+
+        try:
+            for _ in range(3):
+                assert pool.client.get(server_url).text == "ok"
+
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        assert stats.requests == 3
+        assert stats.connections_opened == 1
+        assert stats.open_connections == 1
+        assert stats.reuse_rate == pytest.approx(2 / 3)
+
+    def test_client_is_configured_from_pool(self):
+        pool = ConnectionPool(connect_timeout=1.5,
+                              read_timeout=3,
+                              headers={"User-Agent": "tests"})
+
+        try:
+            client = pool.client
+
+            assert client.timeout.connect_timeout == 1.5
+            assert client.timeout.read_timeout == 3
+            assert client.headers["User-Agent"] == "tests"
+        finally:
+            pool.close()
@@ -0,0 +1,57 @@
+import json
+import random
+
+import pytest
+
+from translation.reporting import LogMode, format_log
+
+
+PAIRS = [("Hallo zusammen", "Hello everyone"),
+         ("Le chat est grand", "The cat is big"),
+         ("Cześć", None)]
+
+
+def test_log_mode_from_string():
+    assert LogMode.from_string("json") is LogMode.JSON
+    assert LogMode.from_string(" Summary ") is LogMode.SUMMARY
+
+    with pytest.raises(ValueError):
+        LogMode.from_string("loud")
+
+
+def test_verbose_log_keeps_the_item_lines():
+    assert format_log(PAIRS[:1]) == (
+        "ITEM  1\nOriginal: Hallo zusammen\nTranslation: Hello everyone\n"
+    )
+
+
+def test_summary_log_is_one_json_line():
+    log = format_log(PAIRS, LogMode.SUMMARY)
+
+    assert log.count("\n") == 1
+    assert json.loads(log) == {"items": 3, "translated": 2, "untranslated": 1}
+
+
+def test_json_log_samples_and_truncates_items():
+    log = format_log(PAIRS, LogMode.JSON, max_chars=5)
+
+    assert json.loads(log)["sample"] == [
+        {"item": 1, "original": "Hallo…", "translation": "Hello…"},
+        {"item": 2, "original": "Le ch…", "translation": "The c…"},
+        {"item": 3, "original": "Cześć", "translation": None},
+    ]
+
+
+def test_json_log_sample_rate():
+    pairs = PAIRS * 1000
+
+    record = json.loads(format_log(pairs,
+                                   LogMode.JSON,
+                                   sample_rate=0.1,
+                                   rng=random.Random(1)))
+
+    assert 200 < len(record["sample"]) < 400
+    assert record["items"] == 3000
+    assert json.loads(format_log(pairs, LogMode.JSON, sample_rate=0))[
+        "sample"
+    ] == []
@@ -0,0 +1,54 @@
+import pytest
+
+from translation import Language, Text, TextBatch
+
+
+def test_texts_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Text("a").__dict__
+
+
+def test_batch_round_trips_texts():
+    texts = [Text("a", Language.DE, Language.EN),
+             Text("b"),
+             Text("c", to_language=Language.OTHER)]
+
+    assert list(TextBatch.from_texts(texts)) == texts
+
+
+def test_batch_columns():
+    batch = TextBatch()
+    batch.append("a", Language.BG)
+    batch.append("b", to_language=Language.FR)
+
+    assert len(batch) == 2
+    assert batch.bodies == ["a", "b"]
+    assert batch.from_language(0) is Language.BG
+    assert batch.from_language(1) is None
+    assert batch.to_language(1) is Language.FR
+
+
+def test_setting_languages():
+    batch = TextBatch.from_texts([Text("a")])
+
+    batch.set_from_language(0, Language.ES)
+    batch.set_to_language(0, Language.DE)
+
+    assert batch[0] == Text("a", Language.ES, Language.DE)
+
+
+def test_slicing_gives_a_batch():
+    texts = [Text(body, Language.DE) for body in "abcd"]
+
+    assert (TextBatch.from_texts(texts)[1:3] ==
+            TextBatch.from_texts(texts[1:3]))
+
+
+def test_update_copies_languages_to_texts():
+    texts = [Text("a"), Text("b")]
+    batch = TextBatch.from_texts(texts)
+    batch.set_from_language(1, Language.EN)
+
+    batch.update(texts)
+
+    assert texts[1].from_language is Language.EN
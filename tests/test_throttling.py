@@ -0,0 +1,181 @@
+import random
+
+import pytest
+
+from translation.backend import Throttled
+from translation.throttling import (
+    AdaptiveRateLimiter,
+    DeadlineExceeded,
+    Retry,
+    TokenBucket
+)
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_rate_must_be_positive(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    def test_burst_is_served_without_waiting(self):
+        time = FakeTime()
+        bucket = TokenBucket(2, capacity=2, clock=time.clock, sleep=time.sleep)
+
+        assert bucket.acquire() == bucket.acquire() == 0.0
+
+    def test_callers_wait_for_refill(self):
+        time = FakeTime()
+        bucket = TokenBucket(2, capacity=1, clock=time.clock, sleep=time.sleep)
+
+        bucket.acquire()
+        bucket.acquire()
+        bucket.acquire()
+
+        assert time.sleeps == [0.5, 0.5]
+
+    def test_tokens_are_refilled_over_time(self):
+        time = FakeTime()
+        bucket = TokenBucket(1, capacity=1, clock=time.clock, sleep=time.sleep)
+
+        bucket.acquire()
+        time.now += 1
+
+        assert bucket.acquire() == 0.0
+
+
+    def test_wait_past_the_deadline_is_not_made(self):
+        time = FakeTime()
+        bucket = TokenBucket(1, capacity=1, clock=time.clock, sleep=time.sleep)
+        bucket.acquire()
+
+        with pytest.raises(DeadlineExceeded):
+            bucket.acquire(deadline=0.5)
+
+        assert time.sleeps == []
+        assert bucket.acquire(deadline=1) == 1
+
+
+class TestAdaptiveRateLimiter:
+    def test_rate_is_decreased_on_throttle(self):
+        limiter = AdaptiveRateLimiter(rate=8, min_rate=3, decrease=0.5)
+
+        limiter.on_throttle()
+        assert limiter.rate == 4
+
+        limiter.on_throttle()
+        assert limiter.rate == 3
+
+        assert limiter.stats().throttle_events == 2
+
+    def test_rate_is_increased_on_success_up_to_max_rate(self):
+        limiter = AdaptiveRateLimiter(rate=4, increase=1, decrease=0.5)
+
+        limiter.on_throttle()
+        limiter.on_success()
+        assert limiter.rate == 3
+
+        limiter.on_success()
+        limiter.on_success()
+        assert limiter.rate == 4
+
+    def test_waits_are_counted(self):
+        time = FakeTime()
+        limiter = AdaptiveRateLimiter(rate=1,
+                                      clock=time.clock,
+                                      sleep=time.sleep)
+
+        limiter.acquire(3)
+
+        assert limiter.stats().seconds_waited == 2
+
+
+class _Flaky:
+    def __init__(self, failures, error=TimeoutError):
+        self.calls = 0
+        self.__failures = failures
+        self.__error = error
+
+    def __call__(self):
+        self.calls += 1
+
+        if self.calls <= self.__failures:
+            raise self.__error("failure")
+
+        return "result"
+
+
+def _retry(**kwargs):
+    return Retry(rng=random.Random(0), sleep=lambda s: None, **kwargs)
+
+
+class TestRetry:
+    def test_max_attempts_must_be_positive(self):
+        with pytest.raises(ValueError):
+            Retry(max_attempts=0)
+
+    def test_transient_failures_are_retried(self):
+        retry = _retry(max_attempts=3)
+        f = _Flaky(failures=2, error=Throttled)
+
+        assert retry.call(f) == "result"
+        assert retry.stats() == (2, 2, 0)
+
+    def test_gives_up_after_max_attempts(self):
+        retry = _retry(max_attempts=2)
+        f = _Flaky(failures=5)
+
+        with pytest.raises(TimeoutError):
+            retry.call(f)
+
+        assert f.calls == 2
+        assert retry.stats() == (1, 0, 1)
+
+    def test_other_errors_are_not_retried(self):
+        retry = _retry()
+        f = _Flaky(failures=1, error=ValueError)
+
+        with pytest.raises(ValueError):
+            retry.call(f)
+
+        assert f.calls == 1
+
+    def test_no_retry_is_made_past_the_deadline(self):
+        retry = _retry(base_delay=10, max_delay=10)
+        f = _Flaky(failures=1)
+
+        with pytest.raises(TimeoutError):
+            retry.call(f, deadline=0)
+
+        assert f.calls == 1
+
+    def test_deadline_exceeded_is_not_retried(self):
+        f = _Flaky(failures=1, error=DeadlineExceeded)
+
+        with pytest.raises(DeadlineExceeded):
+            _retry().call(f)
+
+        assert f.calls == 1
+
+    def test_delays_grow_exponentially_with_jitter(self):
+        delays = []
+        retry = Retry(max_attempts=4,
+                      base_delay=1,
+                      max_delay=3,
+                      sleep=delays.append)
+
+        retry.call(_Flaky(failures=3))
+
+        assert len(delays) == 3
+        assert all(0 <= d <= limit for d, limit in zip(delays, (1, 2, 3)))
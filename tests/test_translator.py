@@ -1,4 +1,5 @@
 import copy
+import time
 
 import pytest
 
@@ -118,3 +119,582 @@ class TestTranslateMany:
 
         assert translations[0] == english_text
         assert isinstance(translations[1], ValueError)
+
+
+def _calls_of(backend, method):
+    return [texts for m, texts in backend.calls if m == method]
+
+
+class TestBackend:
+    def test_defaults_to_google_backend(self):
+        assert isinstance(tr.Translator().backend, tr.GoogleBackend)
+
+    def test_translation_is_delegated_to_backend(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend)
+
+        translated = translator.translate(tr.Text("Hallo", tr.Language.DE))
+
+        assert translated == "Hallo (de->en)"
+        assert backend.calls == [("translate", ["Hallo"])]
+
+    def test_detection_is_delegated_to_backend(self):
+        backend = tr.FakeBackend(detected_language="fr")
+        translator = tr.Translator(backend=backend)
+
+        assert translator.detect_language_of("chat") is tr.Language.FR
+
+
+class TestConcurrentTranslateMany:
+    def test_max_workers_must_be_positive(self):
+        with pytest.raises(ValueError):
+            tr.Translator(max_workers=0)
+
+    def test_order_of_translations_is_kept(self):
+        backend = tr.FakeBackend(latency=0.001)
+        translator = tr.Translator(backend=backend,
+                                   max_workers=4,
+                                   max_batch_size=1)
+        texts = [tr.Text(f"text {i}", tr.Language.DE) for i in range(20)]
+
+        translations = translator.translate_many(texts)
+
+        assert translations == [f"text {i} (de->en)" for i in range(20)]
+
+    def test_exceptions_are_returned_for_failing_translations(self):
+        backend = tr.FakeBackend(fail_on=["fail"], error=ValueError)
+        translator = tr.Translator(backend=backend,
+                                   max_workers=3,
+                                   max_batch_size=1)
+        texts = [tr.Text(body, tr.Language.DE) for body in ("a", "fail", "b")]
+
+        translations = translator.translate_many(texts)
+
+        assert translations[0] == "a (de->en)"
+        assert isinstance(translations[1], ValueError)
+        assert translations[2] == "b (de->en)"
+
+    def test_in_flight_calls_are_capped(self):
+        backend = tr.FakeBackend(latency=0.01)
+        translator = tr.Translator(backend=backend,
+                                   max_workers=3,
+                                   max_batch_size=1)
+        texts = [tr.Text(f"text {i}", tr.Language.DE) for i in range(12)]
+
+        translator.translate_many(texts)
+
+        assert 1 < backend.max_in_flight <= 3
+
+
+class TestCaching:
+    def test_cached_translation_is_reused(self):
+        backend = tr.FakeBackend()
+        cache = tr.LRUCache()
+        translator = tr.Translator(backend=backend, cache=cache)
+
+        first = translator.translate(tr.Text("hi", tr.Language.EN))
+        second = translator.translate(tr.Text("hi ", tr.Language.EN))
+
+        assert first == second == "hi (en->en)"
+        assert _calls_of(backend, "translate") == [["hi"]]
+        assert cache.stats().hits == 1
+
+    def test_cache_is_shared_between_translators(self):
+        backend = tr.FakeBackend()
+        cache = tr.LRUCache()
+
+        for _ in range(2):
+            tr.Translator(backend=backend, cache=cache).translate(
+                tr.Text("hi", tr.Language.EN, tr.Language.DE)
+            )
+
+        assert _calls_of(backend, "translate") == [["hi"]]
+
+    def test_identical_texts_in_batch_are_translated_once(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend, max_workers=4)
+        texts = [
+            tr.Text("hi", tr.Language.EN, tr.Language.DE),
+            tr.Text("bye", tr.Language.EN, tr.Language.DE),
+            tr.Text("hi", tr.Language.EN, tr.Language.DE),
+            tr.Text("hi", tr.Language.EN, tr.Language.FR),
+        ]
+
+        translations = translator.translate_many(texts)
+
+        assert translations == [
+            "hi (en->de)", "bye (en->de)", "hi (en->de)", "hi (en->fr)"
+        ]
+        assert sorted(_calls_of(backend, "translate")) == [
+            ["bye"], ["hi"], ["hi"]
+        ]
+
+    def test_duplicates_get_the_resolved_languages(self):
+        translator = tr.Translator(backend=tr.FakeBackend())
+        texts = [tr.Text("hi"), tr.Text("hi")]
+
+        translator.translate_many(texts)
+
+        assert texts[1].from_language is tr.Language.EN
+        assert texts[1].to_language is tr.Language.EN
+
+
+class TestDetectMany:
+    def test_texts_are_detected_in_one_call(self):
+        backend = tr.FakeBackend(batches_natively=True)
+        translator = tr.Translator(backend=backend)
+
+        languages = translator.detect_many(["hi", "bye", "hi "])
+
+        assert languages == [tr.Language.EN] * 3
+        assert _calls_of(backend, "detect") == [["hi", "bye"]]
+
+    def test_obvious_languages_are_detected_locally(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend)
+
+        languages = translator.detect_many(["Καλημέρα", "你好"])
+
+        assert languages == [tr.Language.OTHER, tr.Language.OTHER]
+        assert backend.calls == []
+
+    def test_cyrillic_texts_are_detected_remotely(self):
+        backend = tr.FakeBackend(detected_language="ru")
+        translator = tr.Translator(backend=backend)
+
+        languages = translator.detect_many(["Привет, как дела?"])
+
+        assert languages == [tr.Language.OTHER]
+        assert _calls_of(backend, "detect") == [["Привет, как дела?"]]
+
+    def test_texts_are_detected_concurrently(self):
+        backend = tr.FakeBackend(latency=0.01)
+        translator = tr.Translator(backend=backend, max_workers=4)
+
+        languages = translator.detect_many([f"text {i}" for i in range(12)])
+
+        assert languages == [tr.Language.EN] * 12
+        assert 1 < backend.max_in_flight <= 4
+
+    def test_detected_languages_are_cached(self):
+        backend = tr.FakeBackend()
+        detection_cache = tr.LRUCache()
+        translator = tr.Translator(backend=backend,
+                                   detection_cache=detection_cache)
+
+        translator.detect_language_of("hi")
+        language = translator.detect_language_of("hi")
+
+        assert language is tr.Language.EN
+        assert len(backend.calls) == 1
+        assert detection_cache.stats().hits == 1
+
+    def test_translate_many_detects_languages_in_one_call(self):
+        backend = tr.FakeBackend(batches_natively=True)
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text("hi"), tr.Text("bye", tr.Language.DE), tr.Text("yo")]
+
+        translator.translate_many(texts)
+
+        assert _calls_of(backend, "detect") == [["hi", "yo"]]
+        assert [t.from_language for t in texts] == [
+            tr.Language.EN, tr.Language.DE, tr.Language.EN
+        ]
+
+
+class TestBatching:
+    def test_batch_limits_must_be_positive(self):
+        with pytest.raises(ValueError):
+            tr.Translator(max_batch_size=0)
+
+        with pytest.raises(ValueError):
+            tr.Translator(max_batch_chars=0)
+
+    def test_texts_are_grouped_by_language_pair(self):
+        backend = tr.FakeBackend(batches_natively=True)
+        translator = tr.Translator(backend=backend)
+        texts = [
+            tr.Text("a", tr.Language.DE),
+            tr.Text("b", tr.Language.FR),
+            tr.Text("c", tr.Language.DE),
+            tr.Text("d", tr.Language.DE, tr.Language.FR),
+        ]
+
+        translations = translator.translate_many(texts)
+
+        assert translations == [
+            "a (de->en)", "b (fr->en)", "c (de->en)", "d (de->fr)"
+        ]
+        assert _calls_of(backend, "translate") == [["a", "c"], ["b"], ["d"]]
+
+    def test_batches_respect_size_limits(self):
+        backend = tr.FakeBackend(batches_natively=True)
+        translator = tr.Translator(backend=backend,
+                                   max_batch_size=2,
+                                   max_batch_chars=7)
+        texts = [tr.Text(body, tr.Language.DE)
+                 for body in ("a", "b", "c", "dddddd", "eeeeeeeeee")]
+
+        translator.translate_many(texts)
+
+        assert _calls_of(backend, "translate") == [
+            ["a", "b"], ["c", "dddddd"], ["eeeeeeeeee"]
+        ]
+
+    def test_groups_are_spread_across_workers(self):
+        backend = tr.FakeBackend(batches_natively=True)
+        translator = tr.Translator(backend=backend, max_workers=2)
+        texts = [tr.Text(body, tr.Language.DE) for body in "abcd"]
+
+        translator.translate_many(texts)
+
+        assert sorted(_calls_of(backend, "translate")) == [
+            ["a", "b"], ["c", "d"]
+        ]
+
+    def test_failing_batch_is_retried_text_by_text(self):
+        backend = tr.FakeBackend(fail_on=["fail"],
+                                 error=ValueError,
+                                 batches_natively=True)
+        translator = tr.Translator(backend=backend, max_batch_size=2)
+        texts = [tr.Text(body, tr.Language.DE)
+                 for body in ("a", "fail", "c")]
+
+        translations = translator.translate_many(texts)
+
+        assert translations[0] == "a (de->en)"
+        assert isinstance(translations[1], ValueError)
+        assert translations[2] == "c (de->en)"
+        assert _calls_of(backend, "translate") == [
+            ["a", "fail"], ["a"], ["fail"], ["c"]
+        ]
+
+    def test_texts_are_sent_one_by_one_without_native_batching(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text(body, tr.Language.DE) for body in "abc"]
+
+        translator.translate_many(texts)
+
+        assert _calls_of(backend, "translate") == [["a"], ["b"], ["c"]]
+
+    def test_only_failing_text_is_retried(self):
+        backend = tr.FakeBackend(fail_on={"t3"}, error=TimeoutError)
+        translator = tr.Translator(
+            backend=backend,
+            retry=tr.Retry(max_attempts=3, sleep=lambda _: None)
+        )
+        texts = [tr.Text(f"t{i}", tr.Language.DE) for i in range(10)]
+
+        translations = translator.translate_many(texts)
+
+        assert [isinstance(t, TimeoutError) for t in translations] == [
+            i == 3 for i in range(10)
+        ]
+        assert len(_calls_of(backend, "translate")) == 12
+
+    def test_unsupported_languages_are_not_sent(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text("a", tr.Language.OTHER), tr.Text("b", tr.Language.DE)]
+
+        translations = translator.translate_many(texts)
+
+        assert isinstance(translations[0], ValueError)
+        assert _calls_of(backend, "translate") == [["b"]]
+
+
+class TestChunking:
+    BODY = "Erster Satz. Zweiter Satz.\n\nDritter Satz."
+
+    def test_max_chunk_chars_must_be_positive(self):
+        with pytest.raises(ValueError):
+            tr.Translator(max_chunk_chars=0)
+
+    def test_long_texts_are_translated_in_chunks(self):
+        backend = tr.FakeBackend(batches_natively=True)
+        translator = tr.Translator(backend=backend, max_chunk_chars=15)
+
+        translation, = translator.translate_many(
+            [tr.Text(self.BODY, tr.Language.DE)]
+        )
+
+        assert translation == ("Erster Satz. (de->en) "
+                               "Zweiter Satz. (de->en)\n\n"
+                               "Dritter Satz. (de->en)")
+        assert _calls_of(backend, "translate") == [
+            ["Erster Satz.", "Zweiter Satz.", "Dritter Satz."]
+        ]
+
+    def test_chunks_are_spread_across_workers(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend,
+                                   max_workers=3,
+                                   max_chunk_chars=15)
+
+        translator.translate_many([tr.Text(self.BODY, tr.Language.DE)])
+
+        assert sorted(_calls_of(backend, "translate")) == [
+            ["Dritter Satz."], ["Erster Satz."], ["Zweiter Satz."]
+        ]
+
+    def test_language_is_detected_once_for_the_whole_text(self):
+        backend = tr.FakeBackend(detected_language="de")
+        translator = tr.Translator(backend=backend, max_chunk_chars=15)
+
+        translator.translate_many([tr.Text(self.BODY)])
+
+        assert _calls_of(backend, "detect") == [[self.BODY[:15]]]
+
+    def test_failed_chunk_fails_the_whole_text(self):
+        backend = tr.FakeBackend(fail_on=["Zweiter Satz."],
+                                 error=TimeoutError)
+        translator = tr.Translator(backend=backend,
+                                   max_batch_size=1,
+                                   max_chunk_chars=15)
+
+        translation, = translator.translate_many(
+            [tr.Text(self.BODY, tr.Language.DE)]
+        )
+
+        assert isinstance(translation, TimeoutError)
+
+    def test_translate_splits_long_texts(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend, max_chunk_chars=15)
+
+        assert translator.translate(
+            tr.Text(self.BODY, tr.Language.DE)
+        ).count("(de->en)") == 3
+
+    def test_short_texts_are_not_split(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend, max_chunk_chars=100)
+
+        translator.translate_many([tr.Text(self.BODY, tr.Language.DE)])
+
+        assert _calls_of(backend, "translate") == [[self.BODY]]
+
+
+class TestStats:
+    def test_parts_without_stats_are_none(self):
+        stats = tr.Translator(backend=tr.FakeBackend()).stats()
+
+        assert stats == tr.TranslatorStats(None, None, None, None, None,
+                                           None, None)
+
+    def test_stats_of_parts_are_collected(self):
+        translator = tr.Translator(backend=tr.FakeBackend(),
+                                   cache=tr.LRUCache(),
+                                   retry=tr.Retry(),
+                                   rate_limiter=tr.AdaptiveRateLimiter(100),
+                                   metrics=tr.Metrics())
+
+        translator.translate_many([tr.Text("a", tr.Language.DE)] * 2)
+        stats = translator.stats()
+
+        assert stats.cache.size == 1
+        assert stats.retry.retries == 0
+        assert stats.rate_limiter.throttle_events == 0
+        assert stats.metrics.items == 2
+        assert stats.metrics.pairs == {"de->en": 1}
+        assert stats.metrics.backend_latency.count == 1
+
+    def test_pool_stats_of_google_backend(self):
+        translator = tr.Translator(backend=tr.GoogleBackend())
+
+        assert translator.stats().pool.requests == 0
+
+    def test_stages_are_recorded(self):
+        metrics = tr.Metrics()
+        translator = tr.Translator(
+            backend=tr.FakeBackend(latency=0.01, detected_language="de"),
+            metrics=metrics
+        )
+
+        translator.translate_many([tr.Text("a"), tr.Text("b")])
+        stages = metrics.snapshot().stages
+
+        assert stages["detect"] >= 0.01
+        assert stages["translate"] >= 0.01
+
+
+class TestTextBatch:
+    def test_batches_are_translated_like_texts(self):
+        texts = [tr.Text("a", tr.Language.DE),
+                 tr.Text("b", to_language=tr.Language.FR),
+                 tr.Text("a", tr.Language.DE)]
+        translator = tr.Translator(backend=tr.FakeBackend())
+
+        assert (
+            translator.translate_many(tr.TextBatch.from_texts(texts)) ==
+            translator.translate_many(texts)
+        )
+
+    def test_resolved_languages_are_set_in_the_batch(self):
+        batch = tr.TextBatch.from_texts([tr.Text("a"), tr.Text("b")])
+        translator = tr.Translator(
+            backend=tr.FakeBackend(detected_language="de")
+        )
+
+        translator.translate_many(batch)
+
+        assert list(batch) == [tr.Text("a", tr.Language.DE, tr.Language.EN),
+                               tr.Text("b", tr.Language.DE, tr.Language.EN)]
+
+    def test_languages_are_set_on_texts(self):
+        texts = [tr.Text("a")]
+        translator = tr.Translator(
+            backend=tr.FakeBackend(detected_language="de")
+        )
+
+        translator.translate_many(texts)
+
+        assert texts == [tr.Text("a", tr.Language.DE, tr.Language.EN)]
+
+
+class TestBackendFailures:
+    def test_backend_errors_are_returned_per_text(self):
+        backend = tr.FakeBackend(fail_on=["b"], error=TimeoutError)
+        translator = tr.Translator(backend=backend, max_batch_size=1)
+        texts = [tr.Text(body, tr.Language.DE) for body in "ab"]
+
+        translations = translator.translate_many(texts)
+
+        assert translations[0] == "a (de->en)"
+        assert isinstance(translations[1], TimeoutError)
+
+    def test_detection_errors_are_returned_for_undetected_texts(self):
+        backend = tr.FakeBackend(fail_on=["b"], error=ConnectionError)
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text("a", tr.Language.DE), tr.Text("b")]
+
+        translations = translator.translate_many(texts)
+
+        assert translations[0] == "a (de->en)"
+        assert isinstance(translations[1], ConnectionError)
+
+
+class TestDeadline:
+    def test_nothing_is_sent_after_the_deadline(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text("a", tr.Language.DE), tr.Text("b")]
+
+        translations = translator.translate_many(
+            texts,
+            deadline=time.monotonic() - 1
+        )
+
+        assert all(isinstance(t, tr.DeadlineExceeded) for t in translations)
+        assert backend.calls == []
+
+    def test_completed_translations_are_kept(self):
+        backend = tr.FakeBackend(latency=0.05)
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text(body, tr.Language.DE) for body in "abc"]
+
+        translations = translator.translate_many(
+            texts,
+            deadline=time.monotonic() + 0.02
+        )
+
+        assert translations[0] == "a (de->en)"
+        assert isinstance(translations[1], tr.DeadlineExceeded)
+        assert isinstance(translations[2], tr.DeadlineExceeded)
+        assert len(backend.calls) == 1
+
+    def test_deadline_is_checked_before_each_request(self):
+        backend = tr.FakeBackend(latency_per_text=0.1)
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text(f"text {i}", tr.Language.DE) for i in range(20)]
+        start = time.monotonic()
+
+        translations = translator.translate_many(texts, deadline=start + 0.5)
+
+        assert time.monotonic() - start < 1
+        assert 0 < len(backend.calls) < 20
+        assert isinstance(translations[-1], tr.DeadlineExceeded)
+
+    def test_detection_stops_at_the_deadline(self):
+        backend = tr.FakeBackend(latency=0.05)
+        translator = tr.Translator(backend=backend)
+        texts = [tr.Text(f"text {i}") for i in range(3)]
+
+        translations = translator.translate_many(
+            texts,
+            deadline=time.monotonic() + 0.02
+        )
+
+        assert _calls_of(backend, "detect") == [["text 0"]]
+        assert _calls_of(backend, "translate") == []
+        assert all(isinstance(t, tr.DeadlineExceeded) for t in translations)
+
+    def test_deadline_exceeded_is_a_timeout(self):
+        assert issubclass(tr.DeadlineExceeded, TimeoutError)
+
+
+class TestThrottling:
+    def test_throttled_batches_are_retried(self):
+        backend = tr.FakeBackend(fail_on=["b"],
+                                 error=tr.Throttled,
+                                 failures_per_text=2)
+        retry = tr.Retry(max_attempts=3, sleep=lambda s: None)
+        limiter = tr.AdaptiveRateLimiter(rate=1000)
+        translator = tr.Translator(backend=backend,
+                                   max_workers=2,
+                                   max_batch_size=1,
+                                   rate_limiter=limiter,
+                                   retry=retry)
+        texts = [tr.Text(body, tr.Language.DE) for body in "ab"]
+
+        translations = translator.translate_many(texts)
+
+        assert translations == ["a (de->en)", "b (de->en)"]
+        assert retry.stats().retries == 2
+        assert limiter.stats().throttle_events == 2
+
+    def test_texts_fail_when_retries_are_exhausted(self):
+        backend = tr.FakeBackend(fail_on=["a"], error=tr.Throttled)
+        retry = tr.Retry(max_attempts=2, sleep=lambda s: None)
+        translator = tr.Translator(backend=backend, retry=retry)
+
+        translation = translator.translate_many([tr.Text("a", tr.Language.DE)])
+
+        assert isinstance(translation[0], tr.Throttled)
+        assert len(backend.calls) == 2
+
+    def test_limiter_paces_backend_calls(self):
+        limiter = tr.AdaptiveRateLimiter(rate=1)
+        translator = tr.Translator(backend=tr.FakeBackend(),
+                                   rate_limiter=limiter)
+
+        translator.translate(tr.Text("a", tr.Language.DE))
+
+        assert limiter.stats().seconds_waited == 0
+
+    def test_limiter_paces_each_request(self):
+        waits = []
+        limiter = tr.AdaptiveRateLimiter(rate=2,
+                                         clock=lambda: 0.0,
+                                         sleep=waits.append)
+        translator = tr.Translator(backend=tr.FakeBackend(),
+                                   rate_limiter=limiter)
+        texts = [tr.Text(body, tr.Language.DE) for body in "abcde"]
+
+        translator.translate_many(texts)
+
+        assert waits == [0.5, 1.0, 1.5]
+
+    def test_limiter_does_not_wait_past_the_deadline(self):
+        backend = tr.FakeBackend()
+        translator = tr.Translator(backend=backend,
+                                   rate_limiter=tr.AdaptiveRateLimiter(rate=2))
+        texts = [tr.Text(f"text {i}", tr.Language.DE) for i in range(20)]
+        start = time.monotonic()
+
+        translations = translator.translate_many(texts, deadline=start + 0.5)
+
+        assert time.monotonic() - start < 1
+        assert len(backend.calls) < 20
+        assert isinstance(translations[-1], tr.DeadlineExceeded)
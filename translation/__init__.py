@@ -1,4 +1,53 @@
-from translation.language import Language
-from translation.text import Text
-from translation.translator import Translator
-from translation.handler import lambda_handler
+"""
+The submodules are imported on first access of their attributes, e.g.
+translation.Translator, so that importing the package is cheap.
+"""
+import importlib
+
+
+_ATTRIBUTES = {
+    "Language": "translation.language",
+    "Text": "translation.text",
+    "TextBatch": "translation.text",
+    "Backend": "translation.backend",
+    "FakeBackend": "translation.backend",
+    "GoogleBackend": "translation.backend",
+    "Throttled": "translation.backend",
+    "AdaptiveRateLimiter": "translation.throttling",
+    "Retry": "translation.throttling",
+    "DeadlineExceeded": "translation.throttling",
+    "LRUCache": "translation.cache",
+    "DynamoCache": "translation.dynamo_cache",
+    "ConnectionPool": "translation.pool",
+    "Translator": "translation.translator",
+    "TranslatorStats": "translation.translator",
+    "Metrics": "translation.metrics",
+    "timed": "translation.metrics",
+    "BlobStore": "translation.blobs",
+    "LocalBlobStore": "translation.blobs",
+    "LogMode": "translation.reporting",
+    "format_log": "translation.reporting",
+    "lambda_handler": "translation.handler",
+    "handle_event": "translation.handler",
+    "TranslationFailed": "translation.handler",
+}
+
+__all__ = list(_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _ATTRIBUTES.get(name)
+
+    if module is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
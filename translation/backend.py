@@ -0,0 +1,266 @@
+"""
+Translation backends - the services that Translator delegates the
+actual translation and language detection to.
+"""
+import threading
+import time
+import zlib
+from typing import List, Protocol, Sequence
+
+from translation.pool import ConnectionPool
+
+
+class Throttled(Exception):
+    """
+    Raised by backends when the service rejects a request because too
+    many requests were sent.
+    """
+
+
+class Backend(Protocol):
+    """
+    The interface of a translation backend. Languages are passed and
+    returned as lowercase ISO 639-1 codes, e.g. 'en'. Failures which
+    may not happen on a retry are reported with Throttled,
+    TimeoutError or ConnectionError.
+
+    batches_natively tells whether translate_batch and detect_batch
+    make a single request for all texts. Translator calls translate
+    and detect one text at a time for backends which don't, so that
+    failures stay per text.
+    """
+    batches_natively: bool
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        ...
+
+    def translate_batch(self,
+                        texts: Sequence[str],
+                        src: str,
+                        dest: str) -> List[str]:
+        ...
+
+    def detect(self, text: str) -> str:
+        ...
+
+    def detect_batch(self, texts: Sequence[str]) -> List[str]:
+        ...
+
+
+class GoogleBackend:
+    """
+    A backend using the googletrans client. googletrans (and httpx
+    under it) is imported and the client is created on first use, so
+    that they don't add to the cold start of a Lambda function.
+    """
+    # googletrans sends one request per text of a list
+    batches_natively = False
+
+    def __init__(self, client=None, pool=None):
+        """
+        :param client: a googletrans.Translator, defaults to a new one
+        created on first use.
+        :param pool: a ConnectionPool for the requests of the client
+        created by default, defaults to a new one.
+        """
+        self.__client = client
+        self.__pool = (pool
+                       if pool is not None
+                       else ConnectionPool())
+        self.__lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self.__client is None:
+            with self.__lock:
+                if self.__client is None:
+                    self.__client = self.__create_client()
+
+        return self.__client
+
+    def __create_client(self):
+        import googletrans
+        from googletrans.constants import DEFAULT_USER_AGENT
+
+        client = googletrans.Translator()
+        client.client.close()
+        client.client = self.__pool.client
+        client.client.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+
+        return client
+
+    @property
+    def pool(self):
+        return self.__pool
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        return [
+            self.__class__.__checked(t).text
+            for t in self.__class__.__request(self.client.translate,
+                                              list(texts),
+                                              src=src,
+                                              dest=dest)
+        ]
+
+    def detect(self, text):
+        return self.detect_batch([text])[0]
+
+    def detect_batch(self, texts):
+        return [
+            self.__class__.__checked(d).lang
+            for d in self.__class__.__request(self.client.detect,
+                                              list(texts))
+        ]
+
+    @staticmethod
+    def __request(f, *args, **kwargs):
+        import httpcore
+
+        try:
+            return f(*args, **kwargs)
+        except httpcore.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        except httpcore.NetworkError as e:
+            raise ConnectionError(str(e)) from e
+
+    @staticmethod
+    def __checked(result):
+        # googletrans returns the original text instead of raising on
+        # unsuccessful responses
+        response = getattr(result, "_response", None)
+        status = getattr(response, "status_code", 200)
+
+        if status == 429:
+            raise Throttled("Too many requests to Google Translate!")
+
+        if status != 200:
+            raise ConnectionError(
+                f"Unexpected status code {status} from Google Translate!"
+            )
+
+        return result
+
+
+class FakeBackend:
+    """
+    A deterministic, in-process backend for tests, benchmarks and load
+    tests. The translation of a text is the text followed by the
+    language pair, e.g. 'Hallo (de->en)'.
+    """
+    def __init__(self,
+                 latency=0.0,
+                 latency_per_text=0.0,
+                 detected_language="en",
+                 error_rate=0.0,
+                 fail_on=(),
+                 error=RuntimeError,
+                 failures_per_text=None,
+                 batches_natively=False):
+        """
+        :param latency: a number - the seconds each call takes.
+        :param latency_per_text: a number - the extra seconds each
+        call takes per text it is given.
+        :param detected_language: a str - the language code that every
+        text is detected as.
+        :param error_rate: a number in [0, 1] - the fraction of texts
+        whose translation and detection fail. Whether a text fails
+        depends only on its contents, so runs are reproducible.
+        :param fail_on: an iterable of strs - texts which always fail.
+        :param error: the Exception subclass raised for failing texts.
+        :param failures_per_text: an int - the number of calls with a
+        failing text which fail before it starts succeeding. None
+        means failing texts always fail.
+        :param batches_natively: a bool - whether the backend stands
+        for a service with batch requests. Defaults to False, like
+        GoogleBackend. A call with a failing text fails as a whole.
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be in [0, 1]!")
+
+        self.__latency = latency
+        self.__latency_per_text = latency_per_text
+        self.__detected_language = detected_language
+        self.__error_threshold = int(error_rate * 2 ** 32)
+        self.__fail_on = frozenset(fail_on)
+        self.__error = error
+        self.__failures_per_text = failures_per_text
+        self.__batches_natively = batches_natively
+        self.__failures = {}
+        self.__lock = threading.Lock()
+        self.__calls = []
+        self.__in_flight = 0
+        self.__max_in_flight = 0
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        self.__call("translate", texts)
+
+        return [f"{t} ({src}->{dest})" for t in texts]
+
+    def detect(self, text):
+        return self.detect_batch([text])[0]
+
+    def detect_batch(self, texts):
+        self.__call("detect", texts)
+
+        return [self.__detected_language for _ in texts]
+
+    def __call(self, method, texts):
+        texts = list(texts)
+
+        with self.__lock:
+            self.__calls.append((method, texts))
+            self.__in_flight += 1
+            self.__max_in_flight = max(self.__max_in_flight,
+                                       self.__in_flight)
+
+        try:
+            time.sleep(self.__latency +
+                       self.__latency_per_text * len(texts))
+
+            for t in texts:
+                if self.__fails(t):
+                    raise self.__error(f"Injected failure for {t!r}")
+        finally:
+            with self.__lock:
+                self.__in_flight -= 1
+
+    def __fails(self, text):
+        if not (text in self.__fail_on or
+                zlib.crc32(text.encode("utf-8")) < self.__error_threshold):
+            return False
+
+        if self.__failures_per_text is None:
+            return True
+
+        with self.__lock:
+            failures = self.__failures.get(text, 0)
+            self.__failures[text] = failures + 1
+
+        return failures < self.__failures_per_text
+
+    @property
+    def batches_natively(self):
+        return self.__batches_natively
+
+    @property
+    def calls(self):
+        """
+        :returns: a list of (method, texts) pairs - one for each call
+        made so far, method being 'translate' or 'detect'.
+        """
+        with self.__lock:
+            return list(self.__calls)
+
+    @property
+    def max_in_flight(self):
+        """
+        :returns: an int - the maximum number of calls that were in
+        progress at the same time.
+        """
+        return self.__max_in_flight
@@ -0,0 +1,68 @@
+"""
+Stores for results too large to be returned by the Lambda function.
+"""
+import os
+import pathlib
+import tempfile
+from typing import Protocol
+
+
+class BlobStore(Protocol):
+    def put(self, name, data):
+        """
+        :param name: a str - the name of the blob, unique per
+        invocation (e.g. its request ID).
+        :param data: bytes.
+        :returns: a str - a reference (URI) to the stored blob.
+        """
+
+
+class LocalBlobStore:
+    """
+    A BlobStore keeping blobs as files in a local directory - a stand-in
+    for object storage, e.g. in tests and local runs.
+    """
+    def __init__(self, directory):
+        """
+        :param directory: a str or a path-like object - the directory
+        to keep the blobs in. It is created if it doesn't exist.
+        """
+        self.__directory = pathlib.Path(directory).resolve()
+
+    def put(self, name, data):
+        path = self.__path_of(name)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.__directory)
+
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(data)
+
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        return path.as_uri()
+
+    def get(self, reference):
+        """
+        :param reference: a str returned by put.
+        :returns: the bytes of the blob.
+        """
+        prefix = self.__directory.as_uri() + "/"
+
+        if not reference.startswith(prefix):
+            raise ValueError(f"Not a blob of this store: {reference!r}")
+
+        return self.__path_of(reference[len(prefix):]).read_bytes()
+
+    def __path_of(self, name):
+        if not name or pathlib.PurePath(name).name != name:
+            raise ValueError(f"Invalid blob name: {name!r}")
+
+        return self.__directory / name
+
+    @property
+    def directory(self):
+        return self.__directory
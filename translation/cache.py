@@ -0,0 +1,138 @@
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+
+        return (self.hits / lookups
+                if lookups > 0
+                else 0.0)
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded mapping which evicts the least recently
+    used entry when full and drops entries older than a TTL.
+    """
+    __MISSING = object()
+
+    def __init__(self, max_size=1024, ttl=None, clock=time.monotonic):
+        """
+        :param max_size: an int - the maximum number of entries.
+        :param ttl: a number - the seconds an entry is valid for, None
+        means entries never expire.
+        :param clock: a callable returning the current time in
+        seconds, defaults to time.monotonic.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive int!")
+
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive!")
+
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key, default=None):
+        """
+        :returns: the value stored for key or default if it is missing
+        or expired. Counts as a hit or a miss.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key, self.__MISSING)
+
+            if (entry is not self.__MISSING and
+                    not self.__has_expired(entry)):
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+
+                return entry[0]
+
+            if entry is not self.__MISSING:
+                del self.__entries[key]
+
+            self.__misses += 1
+
+            return default
+
+    def __has_expired(self, entry):
+        return (entry[1] is not None and
+                entry[1] <= self.__clock())
+
+    def put(self, key, value):
+        expires_at = (self.__clock() + self.__ttl
+                      if self.__ttl is not None
+                      else None)
+
+        with self.__lock:
+            self.__entries[key] = (value, expires_at)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def invalidate(self, key):
+        """
+        Removes the entry for key, if there is one.
+        """
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        with self.__lock:
+            return CacheStats(hits=self.__hits,
+                              misses=self.__misses,
+                              evictions=self.__evictions,
+                              size=len(self.__entries))
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @property
+    def ttl(self):
+        return self.__ttl
+
+
+def normalize(body):
+    """
+    :param body: a str.
+    :returns: the str in NFC form without surrounding whitespace.
+    """
+    return unicodedata.normalize("NFC", body.strip())
+
+
+def translation_key(body, from_language, to_language):
+    """
+    :returns: a hashable key identifying the translation of body
+    between the two languages (Language instances or None).
+    """
+    return (normalize(body) if body is not None else None,
+            from_language,
+            to_language)
@@ -0,0 +1,122 @@
+"""
+Splitting of long texts into chunks which are translated separately
+and joined back together.
+"""
+import re
+
+
+_PARAGRAPH_END = re.compile(r"\n[ \t]*\n\s*")
+
+_SENTENCE_END = re.compile(r"[.!?…。！？]+[\"'”’»)\]]*\s+")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# The boundaries at which texts are split, from the most to the least
+# preferred. Pieces without any of them are split at max_chars.
+_BOUNDARIES = (_PARAGRAPH_END, _SENTENCE_END, _WHITESPACE)
+
+
+def split(body, max_chars):
+    """
+    Splits a text into chunks of at most max_chars characters, at
+    paragraph boundaries where possible, then at sentence boundaries,
+    then between words.
+
+    :param body: a str.
+    :param max_chars: an int - the maximum length of a chunk.
+    :returns: a list of (chunk, separator) pairs - the chunks without
+    trailing whitespace and the whitespace which followed them, so
+    that joining each chunk with its separator gives back the body.
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be a positive int!")
+
+    if len(body) <= max_chars:
+        return [(body, "")]
+
+    pairs = []
+
+    for chunk in _pack(body, max_chars, _BOUNDARIES):
+        if pairs:
+            stripped = chunk.lstrip()
+            last, separator = pairs[-1]
+            pairs[-1] = (last, separator + chunk[:len(chunk) - len(stripped)])
+            chunk = stripped
+
+            if not chunk:
+                continue
+
+        stripped = chunk.rstrip()
+        pairs.append((stripped, chunk[len(stripped):]))
+
+    return pairs
+
+
+def join(translations, separators):
+    """
+    :param translations: an iterable of strs - the translations of the
+    chunks returned by split.
+    :param separators: an iterable of strs - the separators returned by
+    split, in the same order.
+    :returns: the translation of the whole text.
+    """
+    return "".join(t + s for t, s in zip(translations, separators))
+
+
+def _pack(text, max_chars, boundaries):
+    if _length_of(text) <= max_chars:
+        return [text]
+
+    if not boundaries:
+        return [text[i:i + max_chars]
+                for i in range(0, len(text), max_chars)]
+
+    chunks = []
+    current = ""
+
+    for piece in _pieces(text, boundaries[0]):
+        if _length_of(current + piece) <= max_chars:
+            current += piece
+            continue
+
+        if current:
+            chunks.append(current)
+
+        if _length_of(piece) <= max_chars:
+            current = piece
+        else:
+            *full, current = _pack(piece, max_chars, boundaries[1:])
+            chunks.extend(full)
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def _length_of(chunk):
+    """
+    :returns: the length of chunk without its trailing whitespace,
+    which becomes a separator.
+    """
+    return len(chunk.rstrip())
+
+
+def _pieces(text, boundary):
+    """
+    :returns: the parts of text which end at the ends of the matches of
+    boundary (and the rest of it).
+    """
+    pieces = []
+    start = 0
+
+    for match in boundary.finditer(text):
+        if match.end() > start:
+            pieces.append(text[start:match.end()])
+            start = match.end()
+
+    if start < len(text):
+        pieces.append(text[start:])
+
+    return pieces
+
@@ -0,0 +1,49 @@
+"""
+Local language detection for texts whose language is obvious from the
+script they are written in.
+"""
+import unicodedata
+
+from translation.language import Language
+
+
+# Scripts of the supported languages. Each of them is shared with
+# unsupported languages (e.g. Cyrillic with Russian, Ukrainian and
+# Serbian), so texts in them are left to the backend.
+_SUPPORTED_SCRIPTS = frozenset({"LATIN", "CYRILLIC"})
+
+
+def guess_language(body):
+    """
+    Detects the language of a text without a remote call, when the
+    script it is written in leaves no doubt - text with letters from
+    unsupported scripts only (Greek, CJK, Arabic, etc.) is
+    Language.OTHER.
+
+    :param body: a str.
+    :returns: a Language or None, if the language can't be guessed.
+    """
+    scripts = set()
+
+    for c in body:
+        if not c.isalpha():
+            continue
+
+        if c.isascii():
+            return None
+
+        script = _script_of(c)
+
+        if script in _SUPPORTED_SCRIPTS:
+            return None
+
+        scripts.add(script)
+
+    if scripts:
+        return Language.OTHER
+
+    return None
+
+
+def _script_of(c):
+    return unicodedata.name(c, "").split(" ", 1)[0]
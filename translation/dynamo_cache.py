@@ -0,0 +1,272 @@
+"""
+A translation cache shared by all containers of a function, stored in a
+DynamoDB table.
+
+The table handling follows dynamodb.comments.Comments, which is not
+shipped in the function's image (see Dockerfile) and so can't be
+imported here.
+"""
+import hashlib
+import itertools
+import threading
+import time
+from typing import NamedTuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+
+class DynamoCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    writes: int
+    # Failed requests, whose keys counted as misses or were not written
+    errors: int
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+
+        return (self.hits / lookups
+                if lookups > 0
+                else 0.0)
+
+
+class DynamoCache:
+    """
+    A second-level translation cache in a DynamoDB table:
+     - key (HASH) - a SHA-256 hash of the normalized body and the pair
+       of languages
+     - translation
+     - expires_at - the expiry time in seconds since the epoch, which
+       is the table's TTL attribute
+
+    It is best-effort - failed requests count as misses or skipped
+    writes, so that translation goes on without the cache. Only the
+    constructor raises the errors of its requests, as botocore's
+    ClientError and BotoCoreError.
+    """
+    __ATTRIBUTES = [
+        {"AttributeName": "key", "AttributeType": "S"},
+    ]
+
+    __KEY_SCHEMA = [
+        {"AttributeName": "key", "KeyType": "HASH"},
+    ]
+
+    __TTL_ATTRIBUTE = "expires_at"
+
+    # The maximum number of keys in a BatchGetItem request
+    __GET_BATCH_SIZE = 100
+
+    # The maximum number of items in a BatchWriteItem request
+    __WRITE_BATCH_SIZE = 25
+
+    def __init__(self,
+                 dynamo,
+                 name="Translations",
+                 ttl=7 * 24 * 3600,
+                 max_attempts=3,
+                 clock=time.time):
+        """
+        Loads the table or creates one, if it doesn't exist.
+
+        :param dynamo: a DynamoDB boto3.resource
+        :param name: a str - the name of the table, defaults to
+        'Translations'.
+        :param ttl: a number - the seconds a translation is valid for,
+        defaults to a week.
+        :param max_attempts: an int - the number of times a request is
+        sent for keys or items left unprocessed by DynamoDB. They are
+        resent right away, as the cache must not hold up translation.
+        :param clock: a callable returning the current time in seconds
+        since the epoch, defaults to time.time.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive!")
+
+        self.__dynamo = dynamo
+        self.__ttl = ttl
+        self.__max_attempts = max_attempts
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__writes = 0
+        self.__errors = 0
+        self.__load_or_create_table(name)
+
+    def __load_or_create_table(self, name):
+        self.__table = self.__load_table(name)
+
+        if self.__table is None:
+            self.__table = self.__create_table(name)
+
+    def __load_table(self, name):
+        try:
+            table = self.__dynamo.Table(name)
+            table.load()
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ResourceNotFoundException":
+                raise
+
+            return None
+        else:
+            return table
+
+    def __create_table(self, name):
+        table = self.__dynamo.create_table(
+            TableName=name,
+            KeySchema=self.__class__.__KEY_SCHEMA,
+            AttributeDefinitions=self.__class__.__ATTRIBUTES,
+            BillingMode="PAY_PER_REQUEST"
+        )
+        table.wait_until_exists()
+        table.meta.client.update_time_to_live(
+            TableName=name,
+            TimeToLiveSpecification={
+                "Enabled": True,
+                "AttributeName": self.__class__.__TTL_ATTRIBUTE,
+            }
+        )
+
+        return table
+
+    def get_many(self, keys):
+        """
+        Looks up translations with BatchGetItem requests of up to 100
+        keys.
+
+        :param keys: an iterable of translation keys, see
+        translation.cache.translation_key.
+        :returns: a dict mapping the keys which were found to their
+        translations.
+        """
+        keys = list(dict.fromkeys(keys))
+        hashes = {self.__class__.__hash_of(k): k for k in keys}
+        found = {}
+
+        for chunk in self.__class__.__chunks_of(
+                hashes, self.__class__.__GET_BATCH_SIZE):
+            for item in self.__get_chunk(chunk):
+                found[hashes[item["key"]]] = item["translation"]
+
+        with self.__lock:
+            self.__hits += len(found)
+            self.__misses += len(keys) - len(found)
+
+        return found
+
+    def __get_chunk(self, hashes):
+        name = self.__table.name
+        request = {"Keys": [{"key": h} for h in hashes]}
+        now = self.__clock()
+        items = []
+
+        for _ in range(self.__max_attempts):
+            try:
+                response = self.__table.meta.client.batch_get_item(
+                    RequestItems={name: request}
+                )
+            except (BotoCoreError, ClientError):
+                self.__count_error()
+                break
+
+            # Expired items are deleted by DynamoDB only eventually
+            items.extend(
+                i for i in response["Responses"].get(name, [])
+                if i.get(self.__class__.__TTL_ATTRIBUTE, 0) > now
+            )
+            request = response.get("UnprocessedKeys", {}).get(name)
+
+            if not request:
+                break
+
+        return items
+
+    def put_many(self, translations):
+        """
+        Stores translations with BatchWriteItem requests of up to 25
+        items.
+
+        :param translations: a dict mapping translation keys to
+        translations (strs).
+        """
+        expires_at = int(self.__clock() + self.__ttl)
+        items = {
+            self.__class__.__hash_of(k): {
+                "key": self.__class__.__hash_of(k),
+                "translation": t,
+                self.__class__.__TTL_ATTRIBUTE: expires_at,
+            }
+            for k, t in translations.items()
+        }
+
+        for chunk in self.__class__.__chunks_of(
+                items.values(), self.__class__.__WRITE_BATCH_SIZE):
+            self.__write_chunk(chunk)
+
+    def __write_chunk(self, items):
+        name = self.__table.name
+        requests = [{"PutRequest": {"Item": i}} for i in items]
+
+        for _ in range(self.__max_attempts):
+            try:
+                response = self.__table.meta.client.batch_write_item(
+                    RequestItems={name: requests}
+                )
+            except (BotoCoreError, ClientError):
+                self.__count_error()
+                return
+
+            unprocessed = response.get("UnprocessedItems", {}).get(name, [])
+
+            with self.__lock:
+                self.__writes += len(requests) - len(unprocessed)
+
+            requests = unprocessed
+
+            if not requests:
+                return
+
+    def __count_error(self):
+        with self.__lock:
+            self.__errors += 1
+
+    @staticmethod
+    def __hash_of(key):
+        body, from_language, to_language = key
+        data = "\0".join((body or "",
+                          from_language.name,
+                          to_language.name))
+
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def __chunks_of(items, size):
+        items = iter(items)
+
+        while True:
+            chunk = list(itertools.islice(items, size))
+
+            if not chunk:
+                return
+
+            yield chunk
+
+    def stats(self):
+        """
+        :returns: a DynamoCacheStats instance.
+        """
+        with self.__lock:
+            return DynamoCacheStats(hits=self.__hits,
+                                    misses=self.__misses,
+                                    writes=self.__writes,
+                                    errors=self.__errors)
+
+    @property
+    def name(self):
+        return self.__table.name
+
+    @property
+    def ttl(self):
+        return self.__ttl
@@ -1,9 +1,19 @@
 import ast
 import base64
 import enum
+import itertools
+import json
+import re
+from typing import List, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from translation.language import Language
-from translation.text import Text
+from translation.metrics import timed
+from translation.text import Text, TextBatch
 
 
 _EVENT_SOURCE_KEYS = (
@@ -11,6 +21,12 @@ _EVENT_SOURCE_KEYS = (
     "eventSource"
 )
 
+_DICTIONARY_DATA = re.compile(rb"\A\s*\{.*\}\s*\Z", re.DOTALL)
+
+_json_loads = (orjson.loads
+               if orjson is not None
+               else json.loads)
+
 
 @enum.unique
 class EventType(enum.Enum):
@@ -21,39 +37,226 @@ class EventType(enum.Enum):
 
     @classmethod
     def from_string(cls, name):
-        return getattr(cls, name.upper(), EventType.CUSTOM)
+        event_type = _EVENT_TYPES.get(name)
+
+        return (event_type
+                if event_type is not None
+                else _EVENT_TYPES.get(name.upper(), EventType.CUSTOM))
+
+
+_EVENT_TYPES = {
+    spelling: t
+    for t in EventType
+    for spelling in (t.name, t.name.lower(), t.name.title())
+}
+
+
+# Event sources which retry only the records listed in batchItemFailures
+_PARTIAL_FAILURE_TYPES = frozenset({EventType.SQS, EventType.KINESIS})
+
+
+class TranslationFailed(Exception):
+    """
+    Raised by handle_event for events without partial batch responses
+    (SNS and custom events) when the translation of a record failed
+    for a reason other than an unsupported language, so that the
+    invocation fails and can be retried instead of returning None.
+    """
+
+
+def lambda_handler(event, translator, window=None, deadline=None):
+    """
+    :param event: a dict - the event passed to the Lambda function.
+    :param translator: a Translator.
+    :param window: an int - the number of records decoded and
+    translated at a time, see stream. None means the whole batch.
+    :param deadline: see handle_event.
+    :returns: a list of (original text, translation) pairs, the
+    translation being None if the text could not be translated.
+    :raises TranslationFailed: see handle_event.
+    """
+    return handle_event(event, translator, window, deadline).translation
+
+
+def stream(event, translator, window=None, deadline=None):
+    """
+    Lazily decodes, translates and yields the records of an event,
+    window records at a time, so that only the records of the current
+    window are held in memory.
+
+    :returns: a generator of (original text, translation) pairs.
+    """
+    for _, bodies, results in _iter_windows(event,
+                                            translator,
+                                            window,
+                                            deadline):
+        for body, result in zip(bodies, results):
+            yield _pair_of(body, result)
+
+
+class Response(NamedTuple):
+    """
+    translation - a list of (original text, translation) pairs, the
+    translation being None if the text could not be translated.
+    batch_item_failures - for SQS and Kinesis events, a list of
+    {"itemIdentifier": <record ID>} dicts - one for each record whose
+    translation failed for a reason other than an unsupported
+    language and should be retried. None for other events.
+    record_ids - the ID of the record of each pair in translation,
+    None for records without one (custom events).
+    """
+    translation: List[tuple]
+    batch_item_failures: Optional[List[dict]]
+    record_ids: List[Optional[str]]
+
+    def compact_translation(self):
+        """
+        :returns: a dict mapping the ID of each record to its
+        translation, without the original texts. Records without an ID
+        are keyed by their index, as a str.
+        """
+        return {
+            (record_id if record_id is not None else str(i)): t
+            for i, (record_id, (_, t)) in enumerate(zip(self.record_ids,
+                                                        self.translation))
+        }
+
+
+def handle_event(event, translator, window=None, deadline=None):
+    """
+    Like lambda_handler but also reports which records should be
+    retried, in the shape expected by Lambda for partial batch
+    responses.
+
+    :param deadline: a time.monotonic() value after which no more
+    records are sent for translation. They are reported as failures,
+    so that they are retried, and the translated records are kept.
+
+    The time spent decoding the records and building the response is
+    recorded in the metrics of the translator, if it has any, as the
+    parse and respond stages.
+
+    :returns: a Response.
+    :raises TranslationFailed: if a record of an SNS or custom event
+    should be retried, as such events can't report failed records.
+    """
+    translation = []
+    failures = []
+    errors = []
+    ids = []
+
+    for record_ids, bodies, results in _iter_windows(event,
+                                                     translator,
+                                                     window,
+                                                     deadline):
+        with timed(translator.metrics, "respond"):
+            for record_id, body, result in zip(record_ids, bodies, results):
+                translation.append(_pair_of(body, result))
+                ids.append(record_id)
+
+                if _should_retry(result):
+                    failures.append({"itemIdentifier": record_id})
+                    errors.append(result)
+
+    if _determine_type_of(event) not in _PARTIAL_FAILURE_TYPES:
+        if errors:
+            raise TranslationFailed(
+                f"{len(errors)} of {len(translation)} records failed!"
+            ) from errors[0]
+
+        failures = None
+
+    return Response(
+        translation=translation,
+        batch_item_failures=failures,
+        record_ids=ids
+    )
 
 
-def lambda_handler(event, translator):
-    texts = _texts_from(event)
-    translations = translator.translate_many(texts)
+def _should_retry(result):
+    return (isinstance(result, Exception) and
+            not isinstance(result, ValueError))
 
-    return [
-        (t.body, tr if isinstance(tr, str) else None)
-        for t, tr in zip(texts, translations)
-    ]
+
+def _iter_windows(event, translator, window, deadline):
+    """
+    :returns: a generator of (record IDs, bodies, results) triples of
+    lists - one for each window of records.
+    """
+    if window is not None and window < 1:
+        raise ValueError("window must be a positive int!")
+
+    fields = _iter_fields_from(event)
+    record_ids = _iter_record_ids(event)
+
+    while True:
+        with timed(translator.metrics, "parse"):
+            batch = _text_batch_of(itertools.islice(fields, window))
+            ids = list(itertools.islice(record_ids, len(batch)))
+
+        if not batch:
+            return
+
+        yield ids, batch.bodies, translator.translate_many(batch, deadline)
+
+        if window is None:
+            return
+
+
+def _pair_of(body, result):
+    return (body, result if isinstance(result, str) else None)
 
 
 def _texts_from(event):
+    return [Text(*f) for f in _iter_fields_from(event)]
+
+
+def _text_batch_from(event):
+    return _text_batch_of(_iter_fields_from(event))
+
+
+def _text_batch_of(fields):
+    batch = TextBatch()
+
+    for f in fields:
+        batch.append(*f)
+
+    return batch
+
+
+def _iter_fields_from(event):
+    """
+    :returns: an iterator of (body, from language, to language) triples
+    - one for each record of the event - so that they can be collected
+    in a TextBatch without creating a Text for each of them.
+    """
     t = _determine_type_of(event)
 
-    text_from = (
-        _text_from_sns
-        if t is EventType.SNS
-        else _text_from_sqs
-        if t is EventType.SQS
-        else _text_from_kinesis
-        if t is EventType.KINESIS
-        else _text_from_custom_event
-    )
+    if t is EventType.SQS:
+        return (_fields_from_sqs(r) for r in event["Records"])
 
-    texts = text_from(event)
+    if t is EventType.KINESIS:
+        return (_fields_from_kinesis(r) for r in event["Records"])
 
-    return (
-        [texts]
-        if isinstance(texts, Text)
-        else texts
-    )
+    if t is EventType.SNS:
+        return iter([_fields_from_sns(event)])
+
+    return iter([_fields_from_custom_event(event)])
+
+
+def _iter_record_ids(event):
+    t = _determine_type_of(event)
+
+    if t is EventType.SQS:
+        return (r["messageId"] for r in event["Records"])
+
+    if t is EventType.KINESIS:
+        return (r["kinesis"]["sequenceNumber"] for r in event["Records"])
+
+    if t is EventType.SNS:
+        return iter([event["Records"][0]["Sns"].get("MessageId")])
+
+    return iter([None])
 
 
 def _determine_type_of(event):
@@ -72,13 +275,17 @@ def _determine_type_of(event):
 
 
 def _text_from_sns(event):
+    return Text(*_fields_from_sns(event))
+
+
+def _fields_from_sns(event):
     message = event["Records"][0]["Sns"]
     attributes = message["MessageAttributes"]
 
-    return Text(
-        body=message["Message"],
-        from_language=_language_attribute_value("from_language", attributes),
-        to_language=_language_attribute_value("to_language", attributes)
+    return (
+        message["Message"],
+        _language_attribute_value("from_language", attributes),
+        _language_attribute_value("to_language", attributes)
     )
 
 
@@ -102,20 +309,28 @@ def _text_from_sqs(event):
 
 
 def _single_text_from_sqs(record):
+    return Text(*_fields_from_sqs(record))
+
+
+def _fields_from_sqs(record):
     attributes = record["messageAttributes"]
 
-    return Text(
-        body=record["body"],
-        from_language=_language_attribute_value("from_language", attributes),
-        to_language=_language_attribute_value("to_language", attributes)
+    return (
+        record["body"],
+        _language_attribute_value("from_language", attributes),
+        _language_attribute_value("to_language", attributes)
     )
 
 
 def _text_from_custom_event(event):
-    return Text(
-        body=event.get("text", ""),
-        from_language=_create_language(event.get("from_language")),
-        to_language=_create_language(event.get("to_language"))
+    return Text(*_fields_from_custom_event(event))
+
+
+def _fields_from_custom_event(event):
+    return (
+        event.get("text", ""),
+        _create_language(event.get("from_language")),
+        _create_language(event.get("to_language"))
     )
 
 
@@ -127,18 +342,35 @@ def _text_from_kinesis(event):
 
 
 def _single_text_from_kinesis(record):
-    return _text_from_custom_event(
+    return Text(*_fields_from_kinesis(record))
+
+
+def _fields_from_kinesis(record):
+    return _fields_from_custom_event(
         _decode_kinesis_data(record["kinesis"]["data"])
     )
 
 
 def _decode_kinesis_data(d):
-    str_data = base64.b64decode(d).decode("utf-8").strip()
+    data = base64.b64decode(d)
 
-    if str_data.startswith("{") and str_data.endswith("}"):
+    if _DICTIONARY_DATA.match(data):
         try:
-            return ast.literal_eval(str_data)
-        except Exception:
-            pass
+            result = _json_loads(data)
+        except ValueError:
+            result = _literal_eval(data)
+
+        # JSON also allows null, true and false, which would not be a
+        # text to translate
+        if isinstance(result, dict) and isinstance(result.get("text", ""),
+                                                   str):
+            return result
+
+    return {"text": data.decode("utf-8").strip()}
+
 
-    return {"text": str_data}
+def _literal_eval(data):
+    try:
+        return ast.literal_eval(data.decode("utf-8").strip())
+    except Exception:
+        return None
@@ -1,4 +1,5 @@
 import enum
+import re
 
 
 @enum.unique
@@ -12,4 +13,74 @@ class Language(enum.Enum):
 
     @classmethod
     def from_string(cls, s):
-        return getattr(cls, s.upper(), cls.OTHER)
+        """
+        :param s: a str - an ISO 639-1 or 639-2 code ("en", "eng"), a
+        BCP-47 tag ("en-US", "bg_BG") or a language name ("english",
+        "deutsch"), in any case.
+        :returns: the corresponding Language, Language.OTHER for
+        unknown strings.
+        """
+        language = _LANGUAGES.get(s)
+
+        return (language
+                if language is not None
+                else _find_language(s))
+
+
+_ALIASES = {
+    Language.BG: ("bg", "bul", "bulgarian", "български"),
+    Language.EN: ("en", "eng", "english"),
+    Language.DE: ("de", "deu", "ger", "german", "deutsch"),
+    Language.FR: ("fr", "fra", "fre", "french", "français", "francais"),
+    Language.ES: ("es", "spa", "spanish", "español", "espanol", "castellano"),
+    Language.OTHER: ("other",),
+}
+
+# The regions whose tags are common enough to be looked up directly
+_REGIONS = {
+    Language.BG: ("BG",),
+    Language.EN: ("US", "GB", "AU", "CA", "IE", "IN", "NZ", "ZA"),
+    Language.DE: ("DE", "AT", "CH"),
+    Language.FR: ("FR", "BE", "CA", "CH"),
+    Language.ES: ("ES", "MX", "AR", "CO", "US", "419"),
+}
+
+_SUBTAG_SEPARATOR = re.compile(r"[-_]")
+
+
+def _spellings_of(s):
+    return {s, s.lower(), s.upper(), s.title()}
+
+
+def _build_lookup_table():
+    table = {}
+
+    for language, aliases in _ALIASES.items():
+        for alias in aliases:
+            table.update(dict.fromkeys(_spellings_of(alias), language))
+
+    for language, regions in _REGIONS.items():
+        code = language.name.lower()
+
+        for region in regions:
+            for separator in ("-", "_"):
+                tag = f"{code}{separator}{region}"
+                table.update(dict.fromkeys(_spellings_of(tag), language))
+
+    return table
+
+
+# Maps the spellings of the aliases and common tags of each Language
+# to it, so that they are resolved with a single dict lookup
+_LANGUAGES = _build_lookup_table()
+
+
+def _find_language(s):
+    normalized = s.strip().lower()
+    language = _LANGUAGES.get(normalized)
+
+    if language is None:
+        primary_subtag = _SUBTAG_SEPARATOR.split(normalized, 1)[0]
+        language = _LANGUAGES.get(primary_subtag, Language.OTHER)
+
+    return language
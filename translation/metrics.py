@@ -0,0 +1,253 @@
+"""
+Measurements of the stages of an invocation, which can be emitted in
+the CloudWatch Embedded Metric Format (EMF).
+"""
+import bisect
+import contextlib
+import random
+import threading
+import time
+from typing import Dict, NamedTuple, Tuple
+
+
+# The stages of an invocation:
+#  - parse - decoding the records of an event
+#  - detect - detecting the languages of texts
+#  - translate - the rest of Translator.translate_many, including the
+#    calls to the backend
+#  - respond - building the response from the translations
+STAGES = ("parse", "detect", "translate", "respond")
+
+# The upper bounds of the buckets of the backend latency histogram, in
+# milliseconds
+LATENCY_BOUNDS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# The upper bounds of the buckets of the batch size histogram
+BATCH_SIZE_BOUNDS = (1, 2, 5, 10, 25, 50, 100, 250)
+
+# The maximum number of values of a metric in an EMF record
+_MAX_EMF_VALUES = 100
+
+
+class HistogramStats(NamedTuple):
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+    # (upper bound, count) pairs, the last bound being infinity
+    buckets: Tuple[tuple, ...]
+    # A uniform sample of the values observed, at most 100 of them
+    samples: Tuple[float, ...]
+
+    @property
+    def mean(self):
+        return (self.total / self.count
+                if self.count > 0
+                else 0.0)
+
+
+class _Histogram:
+    def __init__(self, bounds, rng):
+        self.__bounds = bounds
+        self.__rng = rng
+        self.__counts = [0] * (len(bounds) + 1)
+        self.__samples = []
+        self.__total = 0.0
+        self.__minimum = float("inf")
+        self.__maximum = 0.0
+
+    def observe(self, value):
+        self.__counts[bisect.bisect_left(self.__bounds, value)] += 1
+        self.__total += value
+        self.__minimum = min(self.__minimum, value)
+        self.__maximum = max(self.__maximum, value)
+        self.__sample(value)
+
+    def __sample(self, value):
+        """
+        Keeps a uniform sample of the values (reservoir sampling), so
+        that the percentiles computed by CloudWatch from the samples
+        cover the whole invocation, not just its first values.
+        """
+        if len(self.__samples) < _MAX_EMF_VALUES:
+            self.__samples.append(value)
+            return
+
+        i = self.__rng.randrange(sum(self.__counts))
+
+        if i < _MAX_EMF_VALUES:
+            self.__samples[i] = value
+
+    def stats(self):
+        count = sum(self.__counts)
+
+        return HistogramStats(
+            count=count,
+            total=self.__total,
+            minimum=self.__minimum if count > 0 else 0.0,
+            maximum=self.__maximum,
+            buckets=tuple(zip(self.__bounds + (float("inf"),),
+                              self.__counts)),
+            samples=tuple(self.__samples)
+        )
+
+
+class MetricsSnapshot(NamedTuple):
+    # Stage name -> seconds spent in it
+    stages: Dict[str, float]
+    items: int
+    # "from->to" language codes -> the number of texts sent to the
+    # backend for that pair
+    pairs: Dict[str, int]
+    batch_sizes: HistogramStats
+    # In milliseconds
+    backend_latency: HistogramStats
+
+
+class Metrics:
+    """
+    A thread-safe collector of the measurements of an invocation. A
+    Translator created with one records into it and the handler adds
+    the stages of its own, see translation.handler.handle_event.
+    """
+    def __init__(self, clock=time.perf_counter, rng=None):
+        """
+        :param clock: a callable returning the current time in seconds,
+        defaults to time.perf_counter.
+        :param rng: a random.Random to sample the values of histograms
+        with, defaults to a new one.
+        """
+        self.__clock = clock
+        self.__rng = (rng
+                      if rng is not None
+                      else random.Random())
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets all measurements, e.g. at the start of an invocation.
+        """
+        with self.__lock:
+            self.__stages = dict.fromkeys(STAGES, 0.0)
+            self.__items = 0
+            self.__pairs = {}
+            self.__batch_sizes = _Histogram(BATCH_SIZE_BOUNDS, self.__rng)
+            self.__backend_latency = _Histogram(LATENCY_BOUNDS, self.__rng)
+
+    @contextlib.contextmanager
+    def time(self, stage):
+        """
+        A context manager adding the time spent in it to a stage.
+        """
+        start = self.__clock()
+
+        try:
+            yield
+        finally:
+            self.add_time(stage, self.__clock() - start)
+
+    def add_time(self, stage, seconds):
+        with self.__lock:
+            self.__stages[stage] = self.__stages.get(stage, 0.0) + seconds
+
+    def add_items(self, n):
+        with self.__lock:
+            self.__items += n
+
+    def add_batch(self, from_language, to_language, size):
+        """
+        Records a batch of texts sent to the backend.
+
+        :param from_language: a Language.
+        :param to_language: a Language.
+        :param size: an int - the number of texts in the batch.
+        """
+        pair = f"{from_language.name.lower()}->{to_language.name.lower()}"
+
+        with self.__lock:
+            self.__pairs[pair] = self.__pairs.get(pair, 0) + size
+            self.__batch_sizes.observe(size)
+
+    def add_backend_call(self, seconds):
+        with self.__lock:
+            self.__backend_latency.observe(seconds * 1000)
+
+    def snapshot(self):
+        """
+        :returns: a MetricsSnapshot.
+        """
+        with self.__lock:
+            return MetricsSnapshot(
+                stages=dict(self.__stages),
+                items=self.__items,
+                pairs=dict(self.__pairs),
+                batch_sizes=self.__batch_sizes.stats(),
+                backend_latency=self.__backend_latency.stats()
+            )
+
+    def to_emf(self, namespace, dimensions=None, timestamp=None):
+        """
+        :param namespace: a str - the CloudWatch namespace.
+        :param dimensions: a dict mapping dimension names to strs,
+        e.g. {"FunctionName": ...}.
+        :param timestamp: a number - seconds since the epoch, defaults
+        to now.
+        :returns: a dict - an EMF record with the measurements, to be
+        written as one JSON line to stdout.
+        """
+        dimensions = dimensions or {}
+        snapshot = self.snapshot()
+        values = {
+            f"{stage.title()}Time": round(seconds * 1000, 3)
+            for stage, seconds in snapshot.stages.items()
+        }
+        units = dict.fromkeys(values, "Milliseconds")
+        values["Items"] = snapshot.items
+        values["BackendCalls"] = snapshot.backend_latency.count
+        units["Items"] = units["BackendCalls"] = "Count"
+
+        for name, histogram, unit in (
+                ("BatchSize", snapshot.batch_sizes, "Count"),
+                ("BackendLatency", snapshot.backend_latency,
+                 "Milliseconds")):
+            if histogram.count > 0:
+                values[name] = [round(v, 3) for v in histogram.samples]
+                units[name] = unit
+
+        return {
+            "_aws": {
+                "Timestamp": int(1000 * (timestamp
+                                         if timestamp is not None
+                                         else time.time())),
+                "CloudWatchMetrics": [{
+                    "Namespace": namespace,
+                    "Dimensions": [list(dimensions)],
+                    "Metrics": [{"Name": n, "Unit": u}
+                                for n, u in units.items()],
+                }],
+            },
+            **dimensions,
+            **values,
+            "LanguagePairs": snapshot.pairs,
+            "BackendLatencyHistogram": {
+                _bucket_name(bound): count
+                for bound, count in snapshot.backend_latency.buckets
+            },
+        }
+
+
+def _bucket_name(bound):
+    return (f"le_{bound}"
+            if bound != float("inf")
+            else "le_inf")
+
+
+def timed(metrics, stage):
+    """
+    :returns: metrics.time(stage) or, if metrics is None, a context
+    manager which does nothing.
+    """
+    return (metrics.time(stage)
+            if metrics is not None
+            else contextlib.nullcontext())
@@ -0,0 +1,121 @@
+import threading
+from typing import NamedTuple
+
+
+class PoolStats(NamedTuple):
+    requests: int
+    connections_opened: int
+    open_connections: int
+
+    @property
+    def reuse_rate(self):
+        """
+        :returns: a float - the fraction of requests which were sent
+        over an already open connection.
+        """
+        return (1 - self.connections_opened / self.requests
+                if self.requests > 0
+                else 0.0)
+
+
+class ConnectionPool:
+    """
+    An explicitly configured pool of keep-alive HTTP connections which
+    can be shared between backends (and kept at module level, so that
+    warm Lambda invocations reuse its connections). The underlying
+    httpx client is created on first use.
+    """
+    def __init__(self,
+                 max_connections=10,
+                 max_keepalive=None,
+                 connect_timeout=5.0,
+                 read_timeout=10.0,
+                 http2=True,
+                 headers=None):
+        """
+        :param max_connections: an int - the maximum number of
+        connections open at the same time.
+        :param max_keepalive: an int - the maximum number of idle
+        connections kept alive, defaults to max_connections.
+        :param connect_timeout: a number - seconds to wait for a
+        connection to be established.
+        :param read_timeout: a number - seconds to wait for a chunk of
+        a response.
+        :param http2: a bool - whether to negotiate HTTP/2.
+        :param headers: a dict with headers sent with each request.
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections must be a positive int!")
+
+        self.__max_connections = max_connections
+        self.__max_keepalive = (max_keepalive
+                                if max_keepalive is not None
+                                else max_connections)
+        self.__connect_timeout = connect_timeout
+        self.__read_timeout = read_timeout
+        self.__http2 = http2
+        self.__headers = dict(headers or {})
+        self.__client = None
+        self.__transport = None
+        self.__lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        :returns: the httpx.Client sending requests through the pool.
+        """
+        if self.__client is None:
+            with self.__lock:
+                if self.__client is None:
+                    self.__create_client()
+
+        return self.__client
+
+    def __create_client(self):
+        import httpx
+
+        from translation import transport
+
+        self.__transport = transport.CountingConnectionPool(
+            ssl_context=transport.create_ssl_context(self.__http2),
+            max_connections=self.__max_connections,
+            max_keepalive=self.__max_keepalive,
+            http2=self.__http2
+        )
+        self.__client = httpx.Client(
+            http2=self.__http2,
+            headers=self.__headers,
+            timeout=httpx.Timeout(connect_timeout=self.__connect_timeout,
+                                  read_timeout=self.__read_timeout,
+                                  write_timeout=self.__read_timeout,
+                                  pool_timeout=self.__connect_timeout),
+            transport=self.__transport
+        )
+
+    def stats(self):
+        """
+        :returns: a PoolStats instance.
+        """
+        if self.__transport is None:
+            return PoolStats(0, 0, 0)
+
+        return PoolStats(
+            requests=self.__transport.requests,
+            connections_opened=self.__transport.connections_opened,
+            open_connections=self.__transport.open_connections
+        )
+
+    def close(self):
+        with self.__lock:
+            if self.__client is not None:
+                self.__client.close()
+                self.__client = None
+                self.__transport = None
+
+    @property
+    def max_connections(self):
+        return self.__max_connections
+
+    @property
+    def max_keepalive(self):
+        return self.__max_keepalive
@@ -0,0 +1,90 @@
+"""
+Formatting of the results of an invocation for the function's log.
+"""
+import enum
+import json
+import random
+
+
+@enum.unique
+class LogMode(enum.Enum):
+    # Three lines per item, as printed by earlier versions
+    VERBOSE = enum.auto()
+    # One JSON line with the counts and a sample of the items
+    JSON = enum.auto()
+    # One JSON line with the counts only
+    SUMMARY = enum.auto()
+
+    @classmethod
+    def from_string(cls, name):
+        try:
+            return cls[name.strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown log mode: {name!r}") from None
+
+
+def format_log(pairs,
+               mode=LogMode.VERBOSE,
+               sample_rate=1.0,
+               max_chars=None,
+               rng=None):
+    """
+    Formats the results of an invocation as one string, so that they
+    are written to the log with a single call.
+
+    :param pairs: a sequence of (original text, translation) pairs, as
+    returned by lambda_handler.
+    :param mode: a LogMode.
+    :param sample_rate: a number between 0 and 1 - the probability of
+    an item being included in a JSON log.
+    :param max_chars: an int - the texts of sampled items are cut to
+    this many characters, None means they are not cut.
+    :param rng: a random.Random to sample with, defaults to the module
+    level one.
+    :returns: a str ending with a newline.
+    """
+    if mode is LogMode.VERBOSE:
+        return "".join(
+            f"ITEM  {i}\nOriginal: {text}\nTranslation: {translation}\n"
+            for i, (text, translation) in enumerate(pairs, start=1)
+        )
+
+    translated = sum(1 for _, t in pairs if t is not None)
+    record = {
+        "items": len(pairs),
+        "translated": translated,
+        "untranslated": len(pairs) - translated,
+    }
+
+    if mode is LogMode.JSON:
+        record["sample"] = [
+            {
+                "item": i,
+                "original": _truncated(text, max_chars),
+                "translation": _truncated(translation, max_chars),
+            }
+            for i, (text, translation) in _sample(pairs, sample_rate, rng)
+        ]
+
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _sample(pairs, rate, rng):
+    if rate >= 1:
+        return enumerate(pairs, start=1)
+
+    if rate <= 0:
+        return iter(())
+
+    uniform = (rng if rng is not None else random).random
+
+    return ((i, pair)
+            for i, pair in enumerate(pairs, start=1)
+            if uniform() < rate)
+
+
+def _truncated(text, max_chars):
+    if text is None or max_chars is None or len(text) <= max_chars:
+        return text
+
+    return text[:max_chars] + "…"
@@ -1,9 +1,12 @@
+from array import array
 from typing import Optional
 
 from translation.language import Language
 
 
 class Text:
+    __slots__ = ("body", "from_language", "to_language")
+
     def __init__(self,
                  body: Optional[str] = None,
                  from_language: Optional[Language] = None,
@@ -19,3 +22,119 @@ class Text:
             self.from_language is other.from_language and
             self.to_language is other.to_language
         )
+
+    def __repr__(self):
+        return (f"{type(self).__name__}({self.body!r}, "
+                f"{self.from_language}, {self.to_language})")
+
+
+# The code of a missing language in the language columns of TextBatch
+_NO_LANGUAGE = 0
+
+_LANGUAGES_BY_CODE = [None] * (max(l.value for l in Language) + 1)
+
+for _language in Language:
+    _LANGUAGES_BY_CODE[_language.value] = _language
+
+
+def _code_of(language):
+    return (language.value
+            if language is not None
+            else _NO_LANGUAGE)
+
+
+class TextBatch:
+    """
+    A sequence of texts stored column by column - a list of bodies and
+    two byte arrays with the codes of their languages - instead of one
+    Text object per text. Indexing it returns a new Text, slicing it
+    returns a new TextBatch.
+    """
+    __slots__ = ("__bodies", "__from_languages", "__to_languages")
+
+    def __init__(self):
+        self.__bodies = []
+        self.__from_languages = array("B")
+        self.__to_languages = array("B")
+
+    @classmethod
+    def from_texts(cls, texts):
+        """
+        :param texts: an iterable of Text instances.
+        :returns: a TextBatch with the texts, in the same order.
+        """
+        batch = cls()
+
+        for t in texts:
+            batch.append(t.body, t.from_language, t.to_language)
+
+        return batch
+
+    def append(self, body, from_language=None, to_language=None):
+        """
+        :param body: a str.
+        :param from_language: a Language or None.
+        :param to_language: a Language or None.
+        """
+        self.__bodies.append(body)
+        self.__from_languages.append(_code_of(from_language))
+        self.__to_languages.append(_code_of(to_language))
+
+    def from_language(self, i):
+        return _LANGUAGES_BY_CODE[self.__from_languages[i]]
+
+    def to_language(self, i):
+        return _LANGUAGES_BY_CODE[self.__to_languages[i]]
+
+    def set_from_language(self, i, language):
+        self.__from_languages[i] = _code_of(language)
+
+    def set_to_language(self, i, language):
+        self.__to_languages[i] = _code_of(language)
+
+    def update(self, texts):
+        """
+        Copies the languages of the batch to the texts it was created
+        from.
+
+        :param texts: a sequence of Text instances, as long as the
+        batch.
+        """
+        for i, t in enumerate(texts):
+            t.from_language = self.from_language(i)
+            t.to_language = self.to_language(i)
+
+    @property
+    def bodies(self):
+        """
+        :returns: the list of bodies of the batch. It is not a copy
+        and must not be modified.
+        """
+        return self.__bodies
+
+    def __len__(self):
+        return len(self.__bodies)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            batch = type(self)()
+            batch.__bodies = self.__bodies[i]
+            batch.__from_languages = self.__from_languages[i]
+            batch.__to_languages = self.__to_languages[i]
+
+            return batch
+
+        return Text(self.__bodies[i],
+                    self.from_language(i),
+                    self.to_language(i))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, other):
+        return (
+            type(self) == type(other) and
+            self.__bodies == other.__bodies and
+            self.__from_languages == other.__from_languages and
+            self.__to_languages == other.__to_languages
+        )
@@ -0,0 +1,256 @@
+"""
+Rate limiting and retrying of backend calls.
+"""
+import random
+import threading
+import time
+from typing import NamedTuple
+
+from translation.backend import Throttled
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Returned for texts which were not sent to the backend because the
+    deadline of Translator.translate_many (or detect_many) passed or
+    would pass while waiting for the rate limiter.
+    """
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket. Callers which find it empty reserve a
+    token and sleep until it is refilled.
+    """
+    def __init__(self, rate, capacity=None, clock=time.monotonic,
+                 sleep=time.sleep):
+        """
+        :param rate: a number - tokens added per second.
+        :param capacity: a number - the maximum number of tokens,
+        i.e. the size of a burst, defaults to max(rate, 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive!")
+
+        self.__rate = rate
+        self.__capacity = (capacity
+                           if capacity is not None
+                           else max(rate, 1))
+        self.__tokens = self.__capacity
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__last_refill = clock()
+        self.__lock = threading.Lock()
+
+    def acquire(self, tokens=1, deadline=None):
+        """
+        Takes tokens from the bucket, waiting for them if needed.
+
+        :param deadline: a value of clock - if the wait would end after
+        it, no tokens are taken and DeadlineExceeded is raised instead.
+        None means no deadline.
+        :returns: a float - the seconds waited.
+        """
+        with self.__lock:
+            self.__refill()
+            tokens_left = self.__tokens - tokens
+            wait = (-tokens_left / self.__rate
+                    if tokens_left < 0
+                    else 0.0)
+
+            if deadline is not None and self.__last_refill + wait > deadline:
+                raise DeadlineExceeded(
+                    "Deadline would pass waiting for the rate limiter!"
+                )
+
+            self.__tokens = tokens_left
+
+        if wait > 0:
+            self.__sleep(wait)
+
+        return wait
+
+    def __refill(self):
+        now = self.__clock()
+        self.__tokens = min(
+            self.__capacity,
+            self.__tokens + (now - self.__last_refill) * self.__rate
+        )
+        self.__last_refill = now
+
+    @property
+    def rate(self):
+        return self.__rate
+
+    @rate.setter
+    def rate(self, value):
+        with self.__lock:
+            self.__refill()
+            self.__rate = value
+
+
+class LimiterStats(NamedTuple):
+    rate: float
+    throttle_events: int
+    seconds_waited: float
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket whose rate adapts to throttling (additive increase,
+    multiplicative decrease): each throttled request multiplies the
+    rate by decrease and each successful one adds increase to it,
+    within [min_rate, max_rate].
+    """
+    def __init__(self,
+                 rate=10.0,
+                 min_rate=0.5,
+                 max_rate=None,
+                 increase=0.1,
+                 decrease=0.5,
+                 clock=time.monotonic,
+                 sleep=time.sleep):
+        """
+        :param rate: a number - the initial requests per second.
+        :param max_rate: a number, defaults to rate.
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be in (0, 1)!")
+
+        self.__bucket = TokenBucket(rate, clock=clock, sleep=sleep)
+        self.__min_rate = min_rate
+        self.__max_rate = (max_rate
+                           if max_rate is not None
+                           else rate)
+        self.__increase = increase
+        self.__decrease = decrease
+        self.__lock = threading.Lock()
+        self.__throttle_events = 0
+        self.__seconds_waited = 0.0
+
+    def acquire(self, tokens=1, deadline=None):
+        """
+        See TokenBucket.acquire.
+        """
+        waited = self.__bucket.acquire(tokens, deadline)
+
+        if waited > 0:
+            with self.__lock:
+                self.__seconds_waited += waited
+
+    def on_success(self):
+        with self.__lock:
+            self.__bucket.rate = min(self.__max_rate,
+                                     self.__bucket.rate + self.__increase)
+
+    def on_throttle(self):
+        with self.__lock:
+            self.__throttle_events += 1
+            self.__bucket.rate = max(self.__min_rate,
+                                     self.__bucket.rate * self.__decrease)
+
+    @property
+    def rate(self):
+        return self.__bucket.rate
+
+    def stats(self):
+        with self.__lock:
+            return LimiterStats(rate=self.__bucket.rate,
+                                throttle_events=self.__throttle_events,
+                                seconds_waited=self.__seconds_waited)
+
+
+class RetryStats(NamedTuple):
+    retries: int
+    throttled: int
+    gave_up: int
+
+
+class Retry:
+    """
+    Retries failed calls with exponential backoff and full jitter:
+    the n-th retry waits a random time in
+    [0, min(max_delay, base_delay * 2 ** (n - 1))].
+    """
+    RETRYABLE = (Throttled, TimeoutError, ConnectionError)
+
+    def __init__(self,
+                 max_attempts=3,
+                 base_delay=0.1,
+                 max_delay=2.0,
+                 retryable=RETRYABLE,
+                 rng=None,
+                 sleep=time.sleep):
+        """
+        :param max_attempts: an int - the number of calls made before
+        giving up, including the first one.
+        :param retryable: a tuple of the Exception subclasses which
+        are retried.
+        :param rng: a random.Random for the jitter.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive int!")
+
+        self.__max_attempts = max_attempts
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+        self.__retryable = retryable
+        self.__rng = (rng
+                      if rng is not None
+                      else random.Random())
+        self.__sleep = sleep
+        self.__lock = threading.Lock()
+        self.__retries = 0
+        self.__throttled = 0
+        self.__gave_up = 0
+
+    def call(self, f, deadline=None):
+        """
+        :param f: a callable without parameters.
+        :param deadline: a time.monotonic() value - no retry is made
+        if its delay would end after it. DeadlineExceeded is never
+        retried.
+        :returns: the result of f.
+        :raises: the last exception raised by f if it still fails
+        after max_attempts calls.
+        """
+        for attempt in range(1, self.__max_attempts + 1):
+            try:
+                return f()
+            except DeadlineExceeded:
+                raise
+            except self.__retryable as e:
+                delay = self.__delay_before_retry(attempt)
+                gives_up = (
+                    attempt == self.__max_attempts or
+                    (deadline is not None and
+                     time.monotonic() + delay >= deadline)
+                )
+                self.__count(e, gives_up)
+
+                if gives_up:
+                    raise
+
+                self.__sleep(delay)
+
+    def __delay_before_retry(self, attempt):
+        return self.__rng.uniform(
+            0,
+            min(self.__max_delay, self.__base_delay * 2 ** (attempt - 1))
+        )
+
+    def __count(self, e, gives_up):
+        with self.__lock:
+            if isinstance(e, Throttled):
+                self.__throttled += 1
+
+            if gives_up:
+                self.__gave_up += 1
+            else:
+                self.__retries += 1
+
+    def stats(self):
+        with self.__lock:
+            return RetryStats(retries=self.__retries,
+                              throttled=self.__throttled,
+                              gave_up=self.__gave_up)
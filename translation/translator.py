@@ -1,17 +1,132 @@
 """
 Top level 'convenience' functions for the package.
 """
-import googletrans as gt
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
 
+from translation import chunking
+from translation.backend import GoogleBackend, Throttled
+from translation.cache import CacheStats, normalize, translation_key
+from translation.detection import guess_language
 from translation.language import Language
+from translation.metrics import MetricsSnapshot, timed
+from translation.pool import PoolStats
+from translation.text import TextBatch
+from translation.throttling import DeadlineExceeded, LimiterStats, RetryStats
+
+
+class _Batch(NamedTuple):
+    """
+    Texts sent to the backend together. The keys are (translation
+    key, chunk index) pairs - one for each of the bodies.
+    """
+    from_language: Language
+    to_language: Language
+    keys: List[tuple]
+    bodies: List[str]
+
+
+class TranslatorStats(NamedTuple):
+    """
+    The statistics of the parts of a Translator, each being None if the
+    Translator does not have that part.
+    """
+    cache: Optional[CacheStats]
+    detection_cache: Optional[CacheStats]
+    retry: Optional[RetryStats]
+    rate_limiter: Optional[LimiterStats]
+    pool: Optional[PoolStats]
+    metrics: Optional[MetricsSnapshot]
+    # e.g. DynamoCacheStats
+    shared_cache: Optional[tuple]
 
 
 class Translator:
-    def __init__(self, default_to_lang=None):
-        self.__google_translator = gt.Translator()
+    def __init__(self,
+                 default_to_lang=None,
+                 backend=None,
+                 max_workers=None,
+                 cache=None,
+                 detection_cache=None,
+                 max_batch_size=100,
+                 max_batch_chars=5000,
+                 rate_limiter=None,
+                 retry=None,
+                 max_chunk_chars=None,
+                 metrics=None,
+                 shared_cache=None):
+        """
+        :param default_to_lang: a Language to translate to when a text
+        does not specify one, defaults to Language.EN.
+        :param backend: the Backend to delegate translation and
+        detection to, defaults to a GoogleBackend.
+        :param max_workers: an int - the maximum number of backend
+        calls that translate_many makes at the same time. None or 1
+        means the calls are made one after another.
+        :param cache: an LRUCache to store translations in, None means
+        no caching. Sharing one instance between translators (or
+        keeping it at module level) lets them reuse each other's
+        results.
+        :param detection_cache: an LRUCache to store detected
+        languages in, None means no caching.
+        :param max_batch_size: an int - the maximum number of texts
+        sent to the backend in a single call, if it batches natively
+        (see Backend), or handled by a worker one after another
+        otherwise.
+        :param max_batch_chars: an int - the maximum total length of
+        the texts sent to the backend in a single call. A longer text
+        is sent on its own.
+        :param rate_limiter: an AdaptiveRateLimiter which paces the
+        backend calls at one token per text - one per request for
+        backends which don't batch natively. None means no limit.
+        Sharing one instance lets translators adapt to throttling
+        together.
+        :param retry: a Retry for failed backend calls, None means
+        failed calls are not retried.
+        :param max_chunk_chars: an int - texts longer than this are
+        split into chunks of at most this many characters, at
+        paragraph and sentence boundaries where possible. The chunks
+        are batched like separate texts (and so translated concurrently
+        only with max_workers above 1) and their translations are
+        joined in order. None means texts are never split.
+        :param metrics: a Metrics to record the durations of detection
+        and translation, the batches and the latency of backend calls
+        in, None means nothing is recorded.
+        :param shared_cache: a second-level cache of translations, e.g.
+        a DynamoCache shared by many containers, None means no such
+        cache. translate_many looks up the texts missing from cache in
+        it with one get_many call and writes the new translations back
+        with one put_many call.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive int!")
+
+        if max_batch_size < 1 or max_batch_chars < 1:
+            raise ValueError("Batch limits must be positive ints!")
+
+        if max_chunk_chars is not None and max_chunk_chars < 1:
+            raise ValueError("max_chunk_chars must be a positive int!")
+
+        self.__backend = (backend
+                          if backend is not None
+                          else GoogleBackend())
         self.__default_to_lang = (default_to_lang
                                   if default_to_lang is not None
                                   else Language.EN)
+        self.__batches_natively = getattr(self.__backend,
+                                          "batches_natively",
+                                          False)
+        self.__max_workers = max_workers
+        self.__cache = cache
+        self.__detection_cache = detection_cache
+        self.__max_batch_size = max_batch_size
+        self.__max_batch_chars = max_batch_chars
+        self.__rate_limiter = rate_limiter
+        self.__retry = retry
+        self.__max_chunk_chars = max_chunk_chars
+        self.__metrics = metrics
+        self.__shared_cache = shared_cache
 
     def __copy__(self):
         raise TypeError("Copying not supported!")
@@ -20,11 +135,107 @@ class Translator:
         raise TypeError("Deep copying not supported!")
 
     def detect_language_of(self, text):
-        return Language.from_string(
-            self.__google_translator.detect(text).lang
+        """
+        :param text: a str.
+        :returns: the Language the text is written in.
+        """
+        return self.detect_many([text])[0]
+
+    def detect_many(self, texts, deadline=None):
+        """
+        Detects the languages of multiple texts. Texts whose language
+        is obvious from their script or is already cached are not sent
+        to the backend and the rest are sent in a single call, if it
+        batches natively (see Backend), or one at a time otherwise.
+
+        :param texts: a sequence of strs.
+        :param deadline: a time.monotonic() value after which no more
+        calls are made to the backend and failed calls are not retried.
+        :returns: a list with the Language of each text.
+        :raises: the exception raised for the first text whose
+        language could not be detected.
+        """
+        languages = self.__detect(texts, deadline)
+
+        for language in languages:
+            if isinstance(language, Exception):
+                raise language
+
+        return languages
+
+    def __detect(self, texts, deadline):
+        """
+        :returns: a list with the Language of each text or the
+        exception raised for it.
+        """
+        languages = [guess_language(t) for t in texts]
+        undetected = {}
+
+        for i, (text, language) in enumerate(zip(texts, languages)):
+            if language is None:
+                key = normalize(text)
+                language = (self.__detection_cache.get(key)
+                            if self.__detection_cache is not None
+                            else None)
+
+                if language is None:
+                    undetected.setdefault(key, []).append(i)
+                else:
+                    languages[i] = language
+
+        if undetected:
+            self.__detect_remotely(texts, undetected, languages, deadline)
+
+        return languages
+
+    def __detect_remotely(self, texts, undetected, languages, deadline):
+        keys = list(undetected)
+        detections = self.__call_many(
+            [texts[undetected[k][0]] for k in keys],
+            self.__backend.detect_batch,
+            self.__backend.detect,
+            deadline,
+            concurrently=True
         )
 
+        for key, detection in zip(keys, detections):
+            if isinstance(detection, Exception):
+                language = detection
+            else:
+                language = Language.from_string(detection)
+
+                if self.__detection_cache is not None:
+                    self.__detection_cache.put(key, language)
+
+            for i in undetected[key]:
+                languages[i] = language
+
     def translate(self, text):
+        if self.__is_long(text.body):
+            translation, = self.translate_many([text])
+
+            if isinstance(translation, Exception):
+                raise translation
+
+            return translation
+
+        self.__resolve_languages_of(text)
+
+        if self.__cache is None:
+            return self.__translate_remotely(text)
+
+        key = translation_key(text.body,
+                              text.from_language,
+                              text.to_language)
+        translation = self.__cache.get(key)
+
+        if translation is None:
+            translation = self.__translate_remotely(text)
+            self.__cache.put(key, translation)
+
+        return translation
+
+    def __resolve_languages_of(self, text):
         if text.from_language is None:
             text.from_language = self.detect_language_of(text.body)
 
@@ -35,24 +246,414 @@ class Translator:
                 text.to_language is Language.OTHER):
             raise ValueError(f"Can't translate: {text.body!r}")
 
-        return self.__google_translator.translate(
-            text.body,
-            src=text.from_language.name.lower(),
-            dest=text.to_language.name.lower()
-        ).text
+    def __translate_remotely(self, text):
+        return self.__call_backend(
+            lambda: self.__backend.translate(
+                text.body,
+                src=text.from_language.name.lower(),
+                dest=text.to_language.name.lower()
+            ),
+            cost=1
+        )
+
+    def translate_many(self, texts, deadline=None):
+        """
+        The languages of all texts without a from_language are
+        detected together, identical texts are translated only once
+        and texts with the same pair of languages are sent to the
+        backend together, in batches of at most max_batch_size texts
+        and max_batch_chars characters.
+
+        :param texts: a TextBatch or an iterable of Text instances.
+        The detected and default languages are set on the texts.
+        :param deadline: a number - a time.monotonic() value after
+        which no more calls are made to the backend. It is checked
+        before each call, so a call made just before it may end after
+        it. Texts which are not translated by then get a
+        DeadlineExceeded, the rest keep their translations. None means
+        no deadline.
+        :returns: a list with the translation (a str) of each text or
+        the exception raised for it, in the order of the texts. A
+        ValueError means the text can't be translated (e.g. its
+        language is not supported) while other exceptions are failures
+        of the backend which may not happen on a retry.
+        """
+        if isinstance(texts, TextBatch):
+            return self.__translate_text_batch(texts, deadline)
+
+        texts = list(texts)
+        batch = TextBatch.from_texts(texts)
+        translations = self.__translate_text_batch(batch, deadline)
+        batch.update(texts)
+
+        return translations
+
+    def __translate_text_batch(self, texts, deadline):
+        translations = [None] * len(texts)
+
+        if self.__metrics is not None:
+            self.__metrics.add_items(len(texts))
+
+        with timed(self.__metrics, "detect"):
+            self.__detect_languages_of(texts, translations, deadline)
+
+        with timed(self.__metrics, "translate"):
+            self.__translate_pending(texts, translations, deadline)
+
+        return translations
+
+    def __translate_pending(self, texts, translations, deadline):
+        pending = self.__pending_translations(texts, translations)
+        self.__serve_from_shared_cache(pending, translations)
+        chunks = self.__chunks_of(pending, texts.bodies)
+        batches = self.__batches_of(chunks)
+        results_of_batches = self.__map(
+            lambda b: self.__translate_batch(b, deadline),
+            batches
+        )
+        results_of_chunks = {key: [None] * len(c)
+                             for key, c in chunks.items()}
+
+        for batch, results in zip(batches, results_of_batches):
+            for (key, chunk), result in zip(batch.keys, results):
+                results_of_chunks[key][chunk] = result
+
+        new_translations = {}
+
+        for key, results in results_of_chunks.items():
+            result = self.__class__.__joined(results, chunks[key])
+
+            if isinstance(result, str):
+                new_translations[key] = result
+
+                if self.__cache is not None:
+                    self.__cache.put(key, result)
+
+            for i in pending[key]:
+                translations[i] = result
+
+        if self.__shared_cache is not None and new_translations:
+            self.__shared_cache.put_many(new_translations)
+
+    def __serve_from_shared_cache(self, pending, translations):
+        if self.__shared_cache is None or not pending:
+            return
+
+        for key, translation in self.__shared_cache.get_many(pending).items():
+            if self.__cache is not None:
+                self.__cache.put(key, translation)
+
+            for i in pending.pop(key):
+                translations[i] = translation
+
+    def __detect_languages_of(self, texts, translations, deadline):
+        undetected = [i
+                      for i in range(len(texts))
+                      if texts.from_language(i) is None]
+
+        if not undetected:
+            return
+
+        bodies = texts.bodies
+        languages = self.__detect(
+            [self.__detection_sample_of(bodies[i]) for i in undetected],
+            deadline
+        )
+
+        for i, language in zip(undetected, languages):
+            if isinstance(language, Exception):
+                translations[i] = language
+            else:
+                texts.set_from_language(i, language)
+
+    def __pending_translations(self, texts, translations):
+        pending = {}
+
+        for i, body in enumerate(texts.bodies):
+            if translations[i] is not None:
+                continue
+
+            from_language = texts.from_language(i)
+            to_language = texts.to_language(i)
+
+            if to_language is None:
+                to_language = self.__default_to_lang
+                texts.set_to_language(i, to_language)
+
+            if (from_language is Language.OTHER or
+                    to_language is Language.OTHER):
+                translations[i] = ValueError(f"Can't translate: {body!r}")
+                continue
+
+            key = translation_key(body, from_language, to_language)
+            positions = pending.get(key)
+
+            if positions is not None:
+                positions.append(i)
+                continue
+
+            cached = (self.__cache.get(key)
+                      if self.__cache is not None
+                      else None)
+
+            if cached is None:
+                pending[key] = [i]
+            else:
+                translations[i] = cached
 
-    def translate_many(self, texts):
-        return [
-            self.__try_to_translate(t)
-            for t in texts
-        ]
+        return pending
 
-    def __try_to_translate(self, text):
+    def __detection_sample_of(self, body):
+        """
+        :returns: the part of body to detect its language from - the
+        whole of it, unless it is split into chunks, in which case it
+        is detected once from its first max_chunk_chars characters.
+        """
+        return (body[:self.__max_chunk_chars]
+                if self.__is_long(body)
+                else body)
+
+    def __is_long(self, body):
+        return (self.__max_chunk_chars is not None and
+                body is not None and
+                len(body) > self.__max_chunk_chars)
+
+    def __chunks_of(self, pending, bodies):
+        """
+        :returns: a dict mapping the keys of pending to the (chunk,
+        separator) pairs of their bodies, see chunking.split.
+        """
+        chunks = {}
+
+        for key, positions in pending.items():
+            body = bodies[positions[0]]
+            chunks[key] = (chunking.split(body, self.__max_chunk_chars)
+                           if self.__is_long(body)
+                           else [(body, "")])
+
+        return chunks
+
+    @staticmethod
+    def __joined(results, chunks):
+        for r in results:
+            if not isinstance(r, str):
+                return r
+
+        return chunking.join(results, (separator for _, separator in chunks))
+
+    def __batches_of(self, chunks):
+        groups = {}
+
+        for key in chunks:
+            groups.setdefault(key[1:], []).append(key)
+
+        batches = []
+
+        for (from_language, to_language), keys in groups.items():
+            parts = [((key, i), chunk)
+                     for key in keys
+                     for i, (chunk, _) in enumerate(chunks[key])]
+            max_size = self.__batch_size_for(len(parts))
+            batch = _Batch(from_language, to_language, [], [])
+            chars = 0
+
+            for part, body in parts:
+                if batch.keys and (
+                        len(batch.keys) == max_size or
+                        chars + len(body) > self.__max_batch_chars):
+                    batches.append(batch)
+                    batch = _Batch(from_language, to_language, [], [])
+                    chars = 0
+
+                batch.keys.append(part)
+                batch.bodies.append(body)
+                chars += len(body)
+
+            batches.append(batch)
+
+        return batches
+
+    def __batch_size_for(self, group_size):
+        workers = self.__max_workers or 1
+
+        return max(1, min(self.__max_batch_size,
+                          -(-group_size // workers)))
+
+    def __translate_batch(self, batch, deadline):
+        if self.__metrics is not None:
+            self.__metrics.add_batch(batch.from_language,
+                                     batch.to_language,
+                                     len(batch.bodies))
+
+        src = batch.from_language.name.lower()
+        dest = batch.to_language.name.lower()
+
+        return self.__call_many(
+            batch.bodies,
+            lambda bodies: self.__backend.translate_batch(bodies,
+                                                          src=src,
+                                                          dest=dest),
+            lambda body: self.__backend.translate(body, src=src, dest=dest),
+            deadline
+        )
+
+    def __call_many(self,
+                    items,
+                    call_batch,
+                    call_one,
+                    deadline,
+                    concurrently=False):
+        """
+        :param concurrently: a bool - whether the items are spread
+        across max_workers workers when they are sent one at a time,
+        for callers which are not run by the workers themselves.
+        :returns: a list with the result of call_one for each item or
+        the exception raised for it, a DeadlineExceeded for the items
+        left when the deadline passes. A backend which batches natively
+        gets all items in one call_batch, which is not retried as a
+        whole - if it fails, the items are retried one at a time, so
+        that one failing item doesn't fail the rest.
+        """
+        if self.__batches_natively and len(items) > 1:
+            try:
+                return self.__call_backend(lambda: call_batch(items),
+                                           cost=len(items),
+                                           deadline=deadline,
+                                           retry=False)
+            except Exception:
+                pass
+
+        def call(item):
+            return self.__call_one(call_one, item, deadline)
+
+        return (self.__map(call, items)
+                if concurrently
+                else [call(i) for i in items])
+
+    def __call_one(self, f, item, deadline):
         try:
-            return self.translate(text)
-        except ValueError as e:
+            return self.__call_backend(lambda: f(item),
+                                       cost=1,
+                                       deadline=deadline)
+        except Exception as e:
             return e
 
+    def __call_backend(self, f, cost, deadline=None, retry=True):
+        self.__class__.__check(deadline)
+
+        if self.__retry is None or not retry:
+            return self.__call_limited(f, cost, deadline)
+
+        return self.__retry.call(
+            lambda: self.__call_limited(f, cost, deadline),
+            deadline
+        )
+
+    def __call_limited(self, f, cost, deadline):
+        if self.__rate_limiter is None:
+            return self.__call_timed(f)
+
+        self.__rate_limiter.acquire(cost, deadline)
+
+        try:
+            result = self.__call_timed(f)
+        except Throttled:
+            self.__rate_limiter.on_throttle()
+            raise
+
+        self.__rate_limiter.on_success()
+
+        return result
+
+    def __call_timed(self, f):
+        if self.__metrics is None:
+            return f()
+
+        start = time.perf_counter()
+
+        try:
+            return f()
+        finally:
+            self.__metrics.add_backend_call(time.perf_counter() - start)
+
+    @staticmethod
+    def __check(deadline):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("Deadline passed before the backend call!")
+
+    def __map(self, f, items):
+        if (self.__max_workers is None or
+                self.__max_workers == 1 or
+                len(items) < 2):
+            return [f(i) for i in items]
+
+        workers = min(self.__max_workers, len(items))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(f, items))
+
+    def stats(self):
+        """
+        :returns: a TranslatorStats.
+        """
+        pool = getattr(self.__backend, "pool", None)
+
+        return TranslatorStats(
+            cache=self.__class__.__stats_of(self.__cache),
+            detection_cache=self.__class__.__stats_of(
+                self.__detection_cache
+            ),
+            retry=self.__class__.__stats_of(self.__retry),
+            rate_limiter=self.__class__.__stats_of(self.__rate_limiter),
+            pool=self.__class__.__stats_of(pool),
+            metrics=(self.__metrics.snapshot()
+                     if self.__metrics is not None
+                     else None),
+            shared_cache=self.__class__.__stats_of(self.__shared_cache)
+        )
+
+    @staticmethod
+    def __stats_of(part):
+        return (part.stats()
+                if part is not None
+                else None)
+
+    @property
+    def backend(self):
+        return self.__backend
+
+    @property
+    def rate_limiter(self):
+        return self.__rate_limiter
+
+    @property
+    def retry(self):
+        return self.__retry
+
     @property
     def default_to_language(self):
         return self.__default_to_lang
+
+    @property
+    def max_workers(self):
+        return self.__max_workers
+
+    @property
+    def shared_cache(self):
+        return self.__shared_cache
+
+    @property
+    def metrics(self):
+        return self.__metrics
+
+    @property
+    def max_chunk_chars(self):
+        return self.__max_chunk_chars
+
+    @property
+    def cache(self):
+        return self.__cache
+
+    @property
+    def detection_cache(self):
+        return self.__detection_cache
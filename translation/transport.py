@@ -0,0 +1,54 @@
+"""
+The HTTP transport behind ConnectionPool. Imported on first use, since
+httpx and httpcore are slow to import.
+"""
+import ssl
+import threading
+
+import certifi
+import httpcore
+
+
+class CountingConnectionPool(httpcore.SyncConnectionPool):
+    """
+    An httpcore connection pool which counts the requests it sends and
+    the connections it opens.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.__counters_lock = threading.Lock()
+        self.__requests = 0
+        self.__connections_opened = 0
+
+    def request(self, *args, **kwargs):
+        with self.__counters_lock:
+            self.__requests += 1
+
+        return super().request(*args, **kwargs)
+
+    def _add_to_pool(self, connection, timeout=None):
+        super()._add_to_pool(connection, timeout=timeout)
+
+        with self.__counters_lock:
+            self.__connections_opened += 1
+
+    @property
+    def requests(self):
+        return self.__requests
+
+    @property
+    def connections_opened(self):
+        return self.__connections_opened
+
+    @property
+    def open_connections(self):
+        return len(self._get_all_connections())
+
+
+def create_ssl_context(http2):
+    context = ssl.create_default_context(cafile=certifi.where())
+    context.set_alpn_protocols(["http/1.1", "h2"]
+                               if http2
+                               else ["http/1.1"])
+
+    return context